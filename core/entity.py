@@ -68,14 +68,16 @@ def generate_entity(game_map):
                             break
                 
                 if safe_position:
-                    # Add position with a random offset to avoid grid alignment
-                    pos_x = x + random.uniform(0.3, 0.7)
-                    pos_y = y + random.uniform(0.3, 0.7)
-                    valid_positions.append((pos_x, pos_y))
+                    valid_positions.append((x, y))
     
     # Select a random position from valid positions
     if valid_positions:
-        pos_x, pos_y = random.choice(valid_positions)
+        x, y = random.choice(valid_positions)
+        
+        # Add a random offset to avoid grid alignment; only the chosen
+        # cell needs one
+        pos_x = x + random.uniform(0.3, 0.7)
+        pos_y = y + random.uniform(0.3, 0.7)
         
         # Generate a random color
         random_color = (
@@ -122,7 +124,7 @@ def is_player_looking_at_entity(player, entity, wall_data, width, height):
     
     # Check if wall is between player and entity - first use raycast data
     mid_x = min(width - 1, max(0, entity.screen_x))
-    if mid_x < len(wall_data) and distance >= wall_data[mid_x].get('perp_wall_dist', float('inf')):
+    if mid_x < len(wall_data) and distance >= wall_data.perp_wall_dist[mid_x]:
         return False
     
     # Optimized ray check - use fewer steps for better performance
@@ -205,7 +207,7 @@ def render_entity(screen, player, entity, wall_data, width, height):
         if entity_width * entity_height < 1000:  # Arbitrary threshold for small entities
             for stripe in range(draw_start_x, draw_end_x + 1):
                 if 0 <= stripe < width and stripe < len(wall_data):
-                    if transform_y < wall_data[stripe].get('perp_wall_dist', float('inf')):
+                    if transform_y < wall_data.perp_wall_dist[stripe]:
                         # Choose color based on whether this is an edge
                         use_color = outline if (stripe == draw_start_x or stripe == draw_end_x or 
                                             abs(stripe - entity_screen_x) <= 1) else color
@@ -220,7 +222,7 @@ def render_entity(screen, player, entity, wall_data, width, height):
             # Process walls in chunks for better performance
             for stripe in range(draw_start_x, draw_end_x + 1):
                 if 0 <= stripe < width and stripe < len(wall_data):
-                    if transform_y < wall_data[stripe].get('perp_wall_dist', float('inf')):
+                    if transform_y < wall_data.perp_wall_dist[stripe]:
                         rel_x = stripe - draw_start_x
                         
                         # Choose color based on whether this is an edge
@@ -25,21 +25,25 @@ class Player:
 
     def rotate(self, angle):
         """Rotate the player direction and camera plane vectors by the given angle."""
+        # Both vectors rotate by the same angle
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        
         # Store old direction vector components
         old_dir_x = self.dir_x
         old_dir_y = self.dir_y
         
         # Rotate direction vector
-        self.dir_x = old_dir_x * math.cos(angle) - old_dir_y * math.sin(angle)
-        self.dir_y = old_dir_x * math.sin(angle) + old_dir_y * math.cos(angle)
+        self.dir_x = old_dir_x * cos_a - old_dir_y * sin_a
+        self.dir_y = old_dir_x * sin_a + old_dir_y * cos_a
         
         # Store old plane vector components
         old_plane_x = self.plane_x
         old_plane_y = self.plane_y
         
         # Rotate camera plane vector
-        self.plane_x = old_plane_x * math.cos(angle) - old_plane_y * math.sin(angle)
-        self.plane_y = old_plane_x * math.sin(angle) + old_plane_y * math.cos(angle)
+        self.plane_x = old_plane_x * cos_a - old_plane_y * sin_a
+        self.plane_y = old_plane_x * sin_a + old_plane_y * cos_a
     
     def move(self, forward, game_map):
         """Move the player forward or backward along the direction vector.
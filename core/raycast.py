@@ -1,86 +1,140 @@
+# Camera plane offsets of each screen column, keyed by screen width
+_camera_x_tables = {}
+
+def _camera_x_table(width):
+    """Return the camera plane offset of every column for a screen width."""
+    table = _camera_x_tables.get(width)
+    if table is None:
+        table = _camera_x_tables[width] = [2 * x / width - 1 for x in range(width)]
+    return table
+
+class WallData:
+    """Per-column raycast results, stored as one list per field."""
+    
+    def __init__(self, player_x, player_y):
+        self.player_x = player_x
+        self.player_y = player_y
+        self.draw_start = []
+        self.draw_end = []
+        self.side = []
+        self.wall_type = []
+        self.perp_wall_dist = []
+        self.ray_dir_x = []
+        self.ray_dir_y = []
+        self.wall_x = []  # For texture mapping
+    
+    def __len__(self):
+        return len(self.perp_wall_dist)
+
+def _trace_ray(game_map, map_width, map_height, pos_x, pos_y, start_x, start_y,
+               ray_dir_x, ray_dir_y):
+    """Walk one ray through the map with DDA and return the cell and side it hits."""
+    # Starting map position
+    map_x, map_y = start_x, start_y
+    
+    # Calculate delta distances - optimized to handle zero cases
+    delta_dist_x = 1e30 if ray_dir_x == 0 else abs(1 / ray_dir_x)
+    delta_dist_y = 1e30 if ray_dir_y == 0 else abs(1 / ray_dir_y)
+    
+    # Pick the step direction and initial side distance once per axis
+    if ray_dir_x < 0:
+        step_x = -1
+        side_dist_x = (pos_x - map_x) * delta_dist_x
+    else:
+        step_x = 1
+        side_dist_x = (map_x + 1.0 - pos_x) * delta_dist_x if ray_dir_x else 1e30
+    if ray_dir_y < 0:
+        step_y = -1
+        side_dist_y = (pos_y - map_y) * delta_dist_y
+    else:
+        step_y = 1
+        side_dist_y = (map_y + 1.0 - pos_y) * delta_dist_y if ray_dir_y else 1e30
+    
+    # Perform DDA with early exit when hitting map boundaries
+    side = 0
+    while True:
+        # Jump to next map square
+        if side_dist_x < side_dist_y:
+            side_dist_x += delta_dist_x
+            map_x += step_x
+            side = 0
+        else:
+            side_dist_y += delta_dist_y
+            map_y += step_y
+            side = 1
+        
+        # Exit loop if out of bounds
+        if map_x < 0 or map_x >= map_width or map_y < 0 or map_y >= map_height:
+            return map_x, map_y, side, 1  # Default wall type for boundaries
+        
+        # Exit loop if hit wall
+        wall_type = game_map[map_y][map_x]
+        if wall_type > 0:
+            return map_x, map_y, side, wall_type
+
 def raycast(player, game_map, width, height):
     """Optimized raycasting function with better performance and texture support."""
-    wall_data = []
     map_width, map_height = len(game_map[0]), len(game_map)
     
     # Precalculate constants outside the loop
     height_half = height // 2
+    pos_x, pos_y = player.pos_x, player.pos_y
+    dir_x, dir_y = player.dir_x, player.dir_y
+    plane_x, plane_y = player.plane_x, player.plane_y
+    start_x, start_y = int(pos_x), int(pos_y)
     
-    for x in range(width):
-        # Calculate ray position and direction
-        camera_x = 2 * x / width - 1
-        ray_dir_x = player.dir_x + player.plane_x * camera_x
-        ray_dir_y = player.dir_y + player.plane_y * camera_x
-        
-        # Starting map position
-        map_x, map_y = int(player.pos_x), int(player.pos_y)
-        
-        # Calculate delta distances - optimized to handle zero cases
-        delta_dist_x = 1e30 if ray_dir_x == 0 else abs(1 / ray_dir_x)
-        delta_dist_y = 1e30 if ray_dir_y == 0 else abs(1 / ray_dir_y)
-        
-        # Calculate step and initial side_dist in a more compact way
-        step_x = 1 if ray_dir_x >= 0 else -1
-        step_y = 1 if ray_dir_y >= 0 else -1
-        
-        # Calculate initial side distances more concisely
-        side_dist_x = (step_x * (map_x + step_x * 0.5 + 0.5 - player.pos_x)) * delta_dist_x if ray_dir_x != 0 else 1e30
-        side_dist_y = (step_y * (map_y + step_y * 0.5 + 0.5 - player.pos_y)) * delta_dist_y if ray_dir_y != 0 else 1e30
-        if ray_dir_x < 0: side_dist_x = (player.pos_x - map_x) * delta_dist_x
-        if ray_dir_y < 0: side_dist_y = (player.pos_y - map_y) * delta_dist_y
-        
-        # Perform DDA with early exit when hitting map boundaries
-        wall_type, side = 0, 0
-        while True:
-            # Jump to next map square
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_dist_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_dist_y
-                map_y += step_y
-                side = 1
-            
-            # Exit loop if out of bounds
-            if map_x < 0 or map_x >= map_width or map_y < 0 or map_y >= map_height:
-                wall_type = 1  # Default wall type for boundaries
-                break
-                
-            # Exit loop if hit wall
-            if game_map[map_y][map_x] > 0:
-                wall_type = game_map[map_y][map_x]
-                break
-        
+    # Calculate ray directions for every column
+    camera_xs = _camera_x_table(width)
+    ray_dirs = [(dir_x + plane_x * camera_x, dir_y + plane_y * camera_x)
+                for camera_x in camera_xs]
+    
+    # Trace every other column first
+    hits = [None] * width
+    for x in range(0, width, 2):
+        ray_dir_x, ray_dir_y = ray_dirs[x]
+        hits[x] = _trace_ray(game_map, map_width, map_height, pos_x, pos_y,
+                             start_x, start_y, ray_dir_x, ray_dir_y)
+    
+    # A ray between two rays that hit the same face of the same cell hits
+    # that face too, so only columns at the edge of a wall need their own DDA
+    for x in range(1, width, 2):
+        hit = hits[x - 1]
+        if x + 1 < width and hits[x + 1] == hit:
+            hits[x] = hit
+        else:
+            ray_dir_x, ray_dir_y = ray_dirs[x]
+            hits[x] = _trace_ray(game_map, map_width, map_height, pos_x, pos_y,
+                                 start_x, start_y, ray_dir_x, ray_dir_y)
+    
+    # Fill one list per field rather than building a dict per column
+    wall_data = WallData(pos_x, pos_y)
+    wall_data.side = [hit[2] for hit in hits]
+    wall_data.wall_type = [hit[3] for hit in hits]
+    wall_data.ray_dir_x = [ray_dir[0] for ray_dir in ray_dirs]
+    wall_data.ray_dir_y = [ray_dir[1] for ray_dir in ray_dirs]
+    add_perp_wall_dist = wall_data.perp_wall_dist.append
+    add_draw_start = wall_data.draw_start.append
+    add_draw_end = wall_data.draw_end.append
+    add_wall_x = wall_data.wall_x.append
+    
+    for (ray_dir_x, ray_dir_y), (map_x, map_y, side, _) in zip(ray_dirs, hits):
         # Calculate perpendicular wall distance to avoid fisheye effect
-        perp_wall_dist = ((map_x - player.pos_x + (1 - step_x) / 2) / ray_dir_x if side == 0 
-                         else (map_y - player.pos_y + (1 - step_y) / 2) / ray_dir_y)
+        if side == 0:
+            perp_wall_dist = (map_x - pos_x + (1 if ray_dir_x < 0 else 0)) / ray_dir_x
+        else:
+            perp_wall_dist = (map_y - pos_y + (1 if ray_dir_y < 0 else 0)) / ray_dir_y
+        add_perp_wall_dist(perp_wall_dist)
         
         # Use a fast integer division and clamping
         line_height = int(height / max(0.001, perp_wall_dist))
-        draw_start = max(0, height_half - line_height // 2)
-        draw_end = min(height - 1, height_half + line_height // 2)
+        add_draw_start(max(0, height_half - line_height // 2))
+        add_draw_end(min(height - 1, height_half + line_height // 2))
         
         # Calculate wall hit position for texturing
         if side == 0:
-            wall_x = player.pos_y + perp_wall_dist * ray_dir_y
+            wall_x = pos_y + perp_wall_dist * ray_dir_y
         else:
-            wall_x = player.pos_x + perp_wall_dist * ray_dir_x
-        wall_x -= int(wall_x)  # Only fractional part
-        
-        # Store wall data with extended texture information
-        wall_data.append({
-            'x': x,
-            'draw_start': draw_start,
-            'draw_end': draw_end,
-            'side': side,
-            'wall_type': wall_type,
-            'perp_wall_dist': perp_wall_dist,
-            'ray_dir_x': ray_dir_x,
-            'ray_dir_y': ray_dir_y,
-            'player_x': player.pos_x,
-            'player_y': player.pos_y,
-            'wall_x': wall_x  # For texture mapping
-        })
+            wall_x = pos_x + perp_wall_dist * ray_dir_x
+        add_wall_x(wall_x - int(wall_x))  # Only fractional part
     
     return wall_data
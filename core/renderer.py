@@ -1,20 +1,17 @@
+import weakref
 import pygame
-from core.config import USE_TEXTURES, TEXTURE_SIZE, CEILING_COLOR, FLOOR_COLOR, TEXTURE_DISTANCE_SHADING, FLOOR_TEXTURE_ENABLED
+from core.config import (USE_TEXTURES, TEXTURE_SIZE, CEILING_COLOR, FLOOR_COLOR, TEXTURE_DISTANCE_SHADING,
+                         FLOOR_TEXTURE_ENABLED, WALL_COLORS, DEFAULT_WALL_COLOR)
+
+# Ceiling and floor textures scaled to the screen, kept until the texture
+# goes away so they are not rescaled every frame
+_scaled_backgrounds = weakref.WeakKeyDictionary()
 
 def render_scene(screen, wall_data, width, height, textures=None):
     """Render the scene using the raycasting data with texture support."""
     # Use configuration settings
     use_textures = USE_TEXTURES and textures is not None
     
-    # Wall colors lookup table (type -> [side0_color, side1_color])
-    WALL_COLORS = {
-        1: [(200, 0, 0), (150, 0, 0)],     # Red walls
-        2: [(0, 200, 0), (0, 150, 0)],     # Green walls
-        3: [(0, 0, 200), (0, 0, 150)],     # Blue walls
-        # Default handled separately
-    }
-    DEFAULT_COLORS = [(158, 158, 158), (100, 100, 100)]
-    
     # Draw ceiling and floor
     if use_textures and 'ceiling' in textures and 'floor' in textures and FLOOR_TEXTURE_ENABLED:
         # Use textured ceiling and floor (more computationally expensive)
@@ -24,17 +21,18 @@ def render_scene(screen, wall_data, width, height, textures=None):
         pygame.draw.rect(screen, CEILING_COLOR, (0, 0, width, height // 2))
         pygame.draw.rect(screen, FLOOR_COLOR, (0, height // 2, width, height // 2))
     
-    # Draw walls efficiently
-    for data in wall_data:
-        x, draw_start, draw_end = data['x'], data['draw_start'], data['draw_end']
+    # Draw walls efficiently; adjacent flat strips with the same extent and
+    # color are merged into one run and filled as a single rectangle
+    run_x = run_width = run_start = run_height = 0
+    run_color = None
+    columns = zip(wall_data.draw_start, wall_data.draw_end, wall_data.wall_type,
+                  wall_data.side, wall_data.perp_wall_dist)
+    for x, (draw_start, draw_end, wall_type, side, perp_wall_dist) in enumerate(columns):
         strip_height = draw_end - draw_start
         
         if strip_height <= 0:  # Skip zero-height strips
             continue
             
-        # Get base color based on wall type and side
-        wall_type, side = data['wall_type'], data['side']
-        
         if use_textures:
             # Create texture key format: wall_1_0 (type 1, side 0)
             texture_key = f'wall_{wall_type}_{side}'
@@ -44,24 +42,11 @@ def render_scene(screen, wall_data, width, height, textures=None):
                 texture = textures[texture_key]
                 texture_width = texture.get_width()
                 
-                # Calculate where on the wall the ray hit
-                if side == 0:
-                    # Vertical wall hit
-                    wall_x = data.get('player_y', 0) + data['perp_wall_dist'] * data.get('ray_dir_y', 0)
-                else:
-                    # Horizontal wall hit
-                    wall_x = data.get('player_x', 0) + data['perp_wall_dist'] * data.get('ray_dir_x', 0)
-                wall_x -= int(wall_x)  # Keep fractional part only
-                
-                # Calculate texture column
-                tex_x = int(wall_x * texture_width)
-                if (side == 0 and data.get('ray_dir_x', 0) > 0) or (side == 1 and data.get('ray_dir_y', 0) < 0):
+                # Calculate texture column from where on the wall the ray hit
+                tex_x = int(wall_data.wall_x[x] * texture_width)
+                if (side == 0 and wall_data.ray_dir_x[x] > 0) or (side == 1 and wall_data.ray_dir_y[x] < 0):
                     tex_x = texture_width - tex_x - 1
                 
-                # Fallback if ray direction not available
-                if 'ray_dir_x' not in data:
-                    tex_x = x % texture_width
-                
                 # Create a subsurface for the texture stripe
                 try:
                     texture_strip = texture.subsurface((tex_x, 0, 1, texture.get_height()))
@@ -71,7 +56,7 @@ def render_scene(screen, wall_data, width, height, textures=None):
                     
                     # Apply distance shading if enabled
                     if TEXTURE_DISTANCE_SHADING:
-                        distance_factor = min(5.0 / data['perp_wall_dist'], 1.0) if data['perp_wall_dist'] > 0 else 1.0
+                        distance_factor = min(5.0 / perp_wall_dist, 1.0) if perp_wall_dist > 0 else 1.0
                         if distance_factor < 0.99:  # Only modify if significant shading needed
                             # Create a surface to apply shading
                             shaded_strip = scaled_strip.copy()
@@ -82,32 +67,36 @@ def render_scene(screen, wall_data, width, height, textures=None):
                     screen.blit(scaled_strip, (x, draw_start))
                 except (ValueError, pygame.error):
                     # Fallback if subsurface fails
-                    draw_flat_wall(screen, x, draw_start, strip_height, wall_type, side, data['perp_wall_dist'])
+                    draw_flat_wall(screen, x, draw_start, strip_height, wall_type, side, perp_wall_dist)
             else:
                 # Texture not available, fall back to flat color
-                draw_flat_wall(screen, x, draw_start, strip_height, wall_type, side, data['perp_wall_dist'])
+                draw_flat_wall(screen, x, draw_start, strip_height, wall_type, side, perp_wall_dist)
         else:
-            # Draw flat-colored wall strip when textures are disabled
-            draw_flat_wall(screen, x, draw_start, strip_height, wall_type, side, data['perp_wall_dist'])
+            # Draw flat-colored wall strips when textures are disabled
+            color = flat_wall_color(wall_type, side, perp_wall_dist)
+            if (x == run_x + run_width and draw_start == run_start and
+                    strip_height == run_height and color == run_color):
+                run_width += 1
+            else:
+                if run_color is not None:
+                    screen.fill(run_color, (run_x, run_start, run_width, run_height))
+                run_x, run_width, run_start, run_height, run_color = x, 1, draw_start, strip_height, color
+    
+    if run_color is not None:
+        screen.fill(run_color, (run_x, run_start, run_width, run_height))
 
 def draw_flat_wall(screen, x, draw_start, strip_height, wall_type, side, distance):
     """Draw a flat-colored wall strip."""
-    # Wall colors lookup
-    WALL_COLORS = {
-        1: [(200, 0, 0), (150, 0, 0)],     # Red walls
-        2: [(0, 200, 0), (0, 150, 0)],     # Green walls
-        3: [(0, 0, 200), (0, 0, 150)],     # Blue walls
-    }
-    DEFAULT_COLORS = [(158, 158, 158), (100, 100, 100)]
-    
-    color = WALL_COLORS.get(wall_type, DEFAULT_COLORS)[side]
+    screen.fill(flat_wall_color(wall_type, side, distance), (x, draw_start, 1, strip_height))
+
+def flat_wall_color(wall_type, side, distance):
+    """Return the distance-shaded flat color of a wall strip."""
+    # Wall colors lookup, shared from the config
+    r, g, b = WALL_COLORS.get(wall_type, DEFAULT_WALL_COLOR)[side]
     
     # Apply distance shading
     distance_factor = min(5.0 / distance, 1.0) if distance > 0 else 1.0
-    color = [int(c * distance_factor) for c in color]
-    
-    # Draw the wall strip
-    pygame.draw.rect(screen, color, (x, draw_start, 1, strip_height))
+    return (int(r * distance_factor), int(g * distance_factor), int(b * distance_factor))
 
 def render_textured_background(screen, width, height, textures):
     """Render textured ceiling and floor."""
@@ -118,18 +107,25 @@ def render_textured_background(screen, width, height, textures):
     # Only simple implementation for now - scaled texturing
     if ceiling_texture:
         # Scale texture to screen width
-        scaled_ceiling = pygame.transform.scale(ceiling_texture, (width, height // 2))
+        scaled_ceiling = scaled_background(ceiling_texture, (width, height // 2))
         screen.blit(scaled_ceiling, (0, 0))
     else:
         pygame.draw.rect(screen, CEILING_COLOR, (0, 0, width, height // 2))
     
     if floor_texture:
         # Scale texture to screen width
-        scaled_floor = pygame.transform.scale(floor_texture, (width, height // 2))
+        scaled_floor = scaled_background(floor_texture, (width, height // 2))
         screen.blit(scaled_floor, (0, height // 2))
     else:
         pygame.draw.rect(screen, FLOOR_COLOR, (0, height // 2, width, height // 2))
 
+def scaled_background(texture, size):
+    """Return a texture scaled to a background size, reusing the last scale of it."""
+    cached = _scaled_backgrounds.get(texture)
+    if cached is None or cached.get_size() != size:
+        cached = _scaled_backgrounds[texture] = pygame.transform.scale(texture, size)
+    return cached
+
 def draw_minimap(screen, player, game_map, width, height, entities=None):
     """Draw a minimap in the corner of the screen."""
     # Minimap settings
@@ -8,7 +8,7 @@ from core.renderer import render_scene, draw_minimap, display_fps
 from core.raycast import raycast
 from core.entity import Entity, render_entity, generate_entity, is_player_looking_at_entity
 from core.interaction import show_interaction_prompt, process_interaction_choice, show_story_interaction, show_story_outcome
-from modules.level_loader import load_level, get_level_names, transition_to_new_level
+from modules.level_loader import load_level, get_level_names, transition_to_new_level, place_player_in_valid_position, is_path_between
 from core.utils import draw_text, draw_fade_overlay
 from modules.dream_story import get_story_segment, process_story_choice, get_dream_summary, reset_story
 # Add texture generator import
@@ -45,7 +45,6 @@ try:
     player.current_map = game_map
     
     # Ensure player is in a valid position
-    from modules.level_loader import place_player_in_valid_position
     place_player_in_valid_position(player, game_map)
     
     # Initialize entity with map reference and validation
@@ -154,7 +153,7 @@ while running:
                 if choice:  # If yes or no was pressed
                     # Process the choice and get outcome
                     theme = current_story_segment["theme"]
-                    question_index = current_story_segment["questions"].index(current_story_segment["question"]) if "questions" in current_story_segment else 0
+                    question_index = current_story_segment.get("question_index", 0)
                     current_outcome = process_story_choice(choice, theme, question_index)
                     
                     # Switch to outcome mode
@@ -299,7 +298,6 @@ while running:
                     entity.color = (255, 200, 100)
                 
                 # Check path to entity
-                from modules.level_loader import is_path_between
                 path_exists = is_path_between(game_map, player.pos_x, player.pos_y, entity.x, entity.y)
                 print(f"Entity is {'reachable' if path_exists else 'NOT reachable'} from player position")
                 
@@ -2,87 +2,349 @@
 Dream story generation module for Some Dream game.
 Provides procedurally generated dream narratives and tracks story progression.
 """
+import asyncio
 import random
 import os
 import json
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict, deque
+from contextvars import ContextVar
+from functools import lru_cache
 
-# Story state - kept for backwards compatibility
-story_state = {
-    "visited_dreams": set(),  # Tracks which dream types player has seen
-    "choices_made": {},       # Tracks choices player has made
-    "dream_depth": 0,         # How deep into the dream narrative
-    "recurring_elements": [], # Elements that recur throughout the dream
-    "emotional_state": "neutral", # Current emotional state of the dream
+from . import dream_themes_builtin
+
+def _new_story_state():
+    """Create a fresh story state dictionary."""
+    return {
+        "visited_dreams": set(),  # Tracks which dream types player has seen
+        "choices_made": {},       # Tracks choices player has made
+        "dream_depth": 0,         # How deep into the dream narrative
+        "recurring_elements": [], # Elements that recur throughout the dream
+        "emotional_state": "neutral", # Current emotional state of the dream
+    }
+
+@lru_cache(maxsize=256)
+def _parse_proc_level(level_name):
+    """Return the level number of a 'proc_<N>' level name, or 0 for anything else."""
+    if level_name.startswith("proc_"):
+        try:
+            return int(level_name.split("_")[1])
+        except (ValueError, IndexError):
+            pass
+    return 0
+
+def _maybe_pick(options, chance):
+    """Return a random item of `options` with probability `chance`, else None.
+    
+    Uses a single random draw: a value below `chance` is rescaled into an index.
+    """
+    if not options:
+        return None
+    r = random.random()
+    if r >= chance:
+        return None
+    return options[min(int(r / chance * len(options)), len(options) - 1)]
+
+# Recurring element unlocked by each (theme, choice) pair
+_RECURRING_ELEMENTS = {
+    ("falling", "yes"): "The sensation of weightlessness",
+    ("falling", "no"): "The fear of impact",
+    ("chase", "yes"): "The face of your pursuer",
+    ("chase", "no"): "The sound of distant footsteps",
+    ("flying", "yes"): "A glimpse of something beyond the clouds",
+    ("flying", "no"): "The fear of falling",
+    ("labyrinth", "yes"): "A mysterious door",
+    ("labyrinth", "no"): "The feeling of being lost",
+    ("teeth", "yes"): "The feeling of transformation",
+    ("teeth", "no"): "The feeling of something missing",
+    ("unprepared", "yes"): "An unexpected supporter",
+    ("unprepared", "no"): "The weight of judgment",
+    ("nature", "yes"): "The language of plants",
+    ("nature", "no"): "Eyes watching from the foliage",
+    ("water", "yes"): "The freedom of breathing underwater",
+    ("water", "no"): "The depths below",
+    ("mansion", "yes"): "A familiar room",
+    ("mansion", "no"): "A locked door",
+    ("classroom", "yes"): "An important lesson",
+    ("classroom", "no"): "A crucial test",
+}
+
+# Generic elements that may start recurring after any choice
+_PROCEDURAL_ELEMENTS = (
+    "A symbol you can't quite remember",
+    "A familiar voice calling your name",
+    "The scent of something from your childhood",
+    "A color that seems to have meaning",
+    "The sensation of being watched",
+    "A melody that feels important",
+    "An object that shouldn't exist",
+    "A phrase repeated in whispers",
+    "A figure glimpsed in periphery",
+    "A clock showing impossible time",
+)
+
+# Phrasings for a recurring element resurfacing in a narrative
+_ECHO_TEMPLATES = (
+    "{element} appears again in the distance.",
+    "{element} seems familiar to you.",
+    "You recognize {element} from a previous dream.",
+    "{element} follows you through the dreamscape.",
+)
+
+# Narrative prefixes once the dream is deep enough
+_DEPTH_PHRASES = (
+    "Deeper in the dream:",
+    "As you sink further into sleep:",
+    "The dream intensifies:",
+    "Reality grows more distant:",
+    "The veil between dreams thins:",
+    "Dream logic strengthens:",
+)
+
+# Narrative tone modifiers by emotional state
+_POSITIVE_MODIFIERS = (
+    "A sense of calm pervades the scene.",
+    "There's an unusual clarity to everything.",
+    "You feel oddly at peace here.",
+    "A pleasant warmth surrounds you.",
+    "Colors seem more vibrant here.",
+)
+_NEGATIVE_MODIFIERS = (
+    "An undercurrent of anxiety flows beneath the surface.",
+    "Something feels wrong about this place.",
+    "Unease settles in your chest.",
+    "Shadows seem to move at the edge of your vision.",
+    "A faint sense of dread accompanies you.",
+)
+
+_TONE_MODIFIERS = {
+    "positive": _POSITIVE_MODIFIERS,
+    "negative": _NEGATIVE_MODIFIERS,
+}
+
+# Outcome reflections
+_REFLECTIONS = (
+    "Something about this feels significant.",
+    "A pattern seems to be forming in your dreams.",
+    "The meaning just eludes your grasp.",
+    "This choice will echo in later dreams.",
+    "Deep meaning resonates beneath the surface.",
+    "This moment feels connected to something larger.",
+)
+_YES_REFLECTIONS = (
+    "There's a sense of rightness to your decision.",
+    "You feel you've chosen well.",
+    "Something aligns within you.",
+    "This path feels meant to be.",
+)
+_NO_REFLECTIONS = (
+    "You wonder what would have happened if you chose differently.",
+    "A path not taken lingers in your thoughts.",
+    "The alternative choice echoes in your mind.",
+    "You feel a moment of hesitation about your decision.",
+)
+_FORESHADOWING = (
+    "You sense this isn't the last time you'll face such a choice.",
+    "This moment will recur in different forms.",
+    "The dream remembers your decision.",
+    "Future dreams will build upon this moment.",
+)
+
+# Summary line for each emotional state
+_EMOTION_SUMMARIES = {
+    "positive": "Your journey has been mostly hopeful.",
+    "negative": "Your path has been filled with anxiety.",
+    "neutral": "Your dream has been a balance of light and dark.",
 }
 
+# Emotional tone of the known themes; all others (labyrinth, falling,
+# classroom, mansion and any new theme) are treated as neutral
+_POSITIVE_THEMES = frozenset({"flying", "nature", "floating", "water"})
+_NEGATIVE_THEMES = frozenset({"chase", "teeth", "unprepared"})
+
+def _read_theme_file(path, validate):
+    """Read and validate one JSON theme file, returning None if it is unusable."""
+    filename = os.path.basename(path)
+    try:
+        # Read the whole file in one call and parse the bytes directly
+        with open(path, 'rb') as f:
+            theme = json.loads(f.read())
+    except Exception as e:
+        print(f"Error loading dream theme {filename}: {e}")
+        return None
+    
+    # Validate theme structure
+    if not validate(theme):
+        print(f"Invalid theme structure in {filename}")
+        return None
+    
+    print(f"Loaded dream theme: {filename.split('.')[0]}")
+    return theme
+
+class _LazyThemeDict(dict):
+    """Theme dict that parses external JSON theme files on first access."""
+    
+    def __init__(self, themes, pending_files, validate, theme_ids):
+        super().__init__(themes)
+        # theme_id -> path of a JSON file that hasn't been read yet
+        self._pending_files = pending_files
+        self._validate = validate
+        # Fixed id order, so loading a theme never moves it in the list;
+        # only a file that fails to load is taken out
+        self._theme_ids = theme_ids
+        # Every manager shares this dict, so files are read under a lock
+        self._lock = threading.Lock()
+    
+    def theme_ids(self):
+        """Return every usable theme id, loaded or still pending, in a fixed order."""
+        return self._theme_ids
+    
+    def __missing__(self, theme_id):
+        with self._lock:
+            # Another thread may have loaded the theme while this one waited
+            new_theme = self.get(theme_id)
+            if new_theme is not None:
+                return new_theme
+            
+            path = self._pending_files.pop(theme_id, None)
+            if path is None:
+                raise KeyError(theme_id)
+            
+            new_theme = _read_theme_file(path, self._validate)
+            if new_theme is None:
+                # Take a bad file out of selection, as if it was never there
+                self._theme_ids = tuple(t for t in self._theme_ids if t != theme_id)
+                raise KeyError(theme_id)
+            
+            self[theme_id] = new_theme
+            return new_theme
+
 # Create a DreamManager class to handle dream story generation
 class DreamManager:
     """Manages dream narratives and story progression."""
     
+    # Validated themes shared by every manager, loaded on first use
+    _themes_loaded = None
+    _themes_lock = threading.Lock()
+    
     def __init__(self):
-        # Initialize with existing story state for backward compatibility
-        self.state = story_state
+        # Each manager owns its story state so sessions never share progress
+        self.state = _new_story_state()
         self.themes = {}
+        # How many times each theme has been visited, for rotating its text
+        self._visit_counts = defaultdict(int)
+        # Running yes/no tallies per theme, so choices never need rescanning
+        self._choice_counts = defaultdict(lambda: {"yes": 0, "no": 0})
+        # The last two themes visited, in order, to avoid immediate repeats
+        self._recent_themes = deque(maxlen=2)
+        # Recurring elements in least- to most-recent order (keys only)
+        self._recurring_elements = OrderedDict()
         # Add dream summary cache to fix glitchy text
         self._dream_summary_cache = "The dream begins..."
-        self._last_summary_state = {
-            "dream_depth": 0,
-            "emotional_state": "neutral",
-            "recurring_elements": [],
-            "visited_dreams": set()
-        }
+        self._last_summary_key = (0, "neutral", (), frozenset())
         self._load_theme_data()
     
     def _load_theme_data(self):
         """Load theme data from built-in themes and external JSON files."""
-        from . import dream_themes_builtin
+        # Themes are scanned once per process, and every later manager
+        # (e.g. after reset_story) shares the same lazily filled theme dict
+        with DreamManager._themes_lock:
+            if DreamManager._themes_loaded is None:
+                DreamManager._themes_loaded = self._read_theme_data()
+        self.themes = DreamManager._themes_loaded
+        
+        # Each theme's text flattened into a Theme namedtuple,
+        # filled in as themes are first used
+        self._theme_text = {}
+        self._index_themes()
+    
+    def _index_themes(self):
+        """Build the theme selection tables from the currently usable theme ids."""
+        self._theme_keys = self.themes.theme_ids()
+        
+        # Categorize themes once here rather than on every selection
+        self._theme_categories = self._build_theme_categories()
+        
+        # Precompute procedural-level weights for every base index: higher
+        # weight for the base theme, falling off with (wrapped) distance
+        count = len(self._theme_keys)
+        self._proc_theme_weights = tuple(
+            tuple(max(1.0 - min(abs(i - base), count - abs(i - base)) * 0.2, 0.0)
+                  for i in range(count))
+            for base in range(count)
+        )
         
+        # Precompute, for each theme, the tuple of every other theme
+        self._theme_keys_excluding = {
+            theme: tuple(other for other in self._theme_keys if other != theme)
+            for theme in self._theme_keys
+        }
+    
+    def _read_theme_data(self):
+        """Collect built-in themes and register external JSON theme files."""
         # First load built-in themes from the module
-        self.themes = dream_themes_builtin.DREAM_THEMES.copy()
+        themes = dream_themes_builtin.DREAM_THEMES.copy()
         
-        # Then try to load additional themes from files if they exist
+        # External theme files are only parsed when a theme is first used
+        pending_files = {}
         theme_dir = os.path.join(os.path.dirname(__file__), 'dream_themes')
         if os.path.exists(theme_dir):
-            for filename in os.listdir(theme_dir):
+            for filename in sorted(os.listdir(theme_dir)):
                 if filename.endswith('.json'):
-                    try:
-                        with open(os.path.join(theme_dir, filename), 'r') as f:
-                            new_theme = json.load(f)
-                            theme_id = filename.split('.')[0]
-                            
-                            # Validate theme structure
-                            if self._validate_theme(new_theme):
-                                self.themes[theme_id] = new_theme
-                                print(f"Loaded dream theme: {theme_id}")
-                            else:
-                                print(f"Invalid theme structure in {filename}")
-                    except Exception as e:
-                        print(f"Error loading dream theme {filename}: {e}")
-        
-        print(f"Total dream themes loaded: {len(self.themes)}")
+                    pending_files[filename.split('.')[0]] = os.path.join(theme_dir, filename)
+        
+        # Built-in ids in their own order, then file-only ids sorted; level
+        # theme choice indexes into this order, so it must not depend on
+        # which themes happen to have been parsed yet
+        theme_ids = tuple(themes) + tuple(t for t in pending_files if t not in themes)
+        
+        # A file overriding a built-in theme is read now, since the built-in
+        # entry would otherwise always be found first; a bad one leaves the
+        # built-in in place
+        for theme_id in themes:
+            path = pending_files.pop(theme_id, None)
+            if path is not None:
+                override = _read_theme_file(path, self._validate_theme)
+                if override is not None:
+                    themes[theme_id] = override
+        
+        lazy_themes = _LazyThemeDict(themes, pending_files, self._validate_theme, theme_ids)
+        print(f"Total dream themes available: {len(lazy_themes.theme_ids())}")
+        return lazy_themes
+    
+    @classmethod
+    def reload_themes(cls):
+        """Drop the cached themes so the next manager rereads them from disk."""
+        cls._themes_loaded = None
     
-    def _validate_theme(self, theme):
+    @staticmethod
+    def _validate_theme(theme):
         """Validate that a theme has the required structure."""
-        required_keys = ["narratives", "questions", "outcomes"]
-        outcome_keys = ["yes", "no"]
-        
-        # Check basic structure
-        if not all(key in theme for key in required_keys):
+        # Check basic structure: a dict with list-valued narratives/questions
+        # and an outcomes dict holding yes/no lists
+        if not isinstance(theme, dict):
             return False
-            
-        # Check that outcomes contains yes/no
-        if not all(key in theme["outcomes"] for key in outcome_keys):
+        narratives = theme.get("narratives")
+        questions = theme.get("questions")
+        outcomes = theme.get("outcomes")
+        if not (isinstance(narratives, list) and isinstance(questions, list) and
+                isinstance(outcomes, dict)):
             return False
-            
+        yes_outcomes = outcomes.get("yes")
+        no_outcomes = outcomes.get("no")
+        if not (isinstance(yes_outcomes, list) and isinstance(no_outcomes, list)):
+            return False
+        
         # Check that lists have content and matching lengths
-        if (len(theme["narratives"]) == 0 or
-            len(theme["questions"]) == 0 or
-            len(theme["outcomes"]["yes"]) != len(theme["questions"]) or
-            len(theme["outcomes"]["no"]) != len(theme["questions"])):
+        if (not narratives or not questions or
+            len(yes_outcomes) != len(questions) or
+            len(no_outcomes) != len(questions)):
             return False
-            
-        return True
+        
+        # Every entry must be text
+        return all(isinstance(text, str)
+                   for texts in (narratives, questions, yes_outcomes, no_outcomes)
+                   for text in texts)
     
     # Add the missing _analyze_map_features method
     def _analyze_map_features(self, game_map):
@@ -94,46 +356,51 @@ class DreamManager:
             "verticality": 0
         }
         
+        # Cache map dimensions once
+        height = len(game_map)
+        width = len(game_map[0])
+        
         # Skip if map is too small
-        if len(game_map) <= 5 or len(game_map[0]) <= 5:
+        if height <= 5 or width <= 5:
             return features
             
-        # Sample the map to determine its nature
-        for y in range(1, len(game_map)-1, 2):
-            for x in range(1, len(game_map[0])-1, 2):
-                if game_map[y][x] == 0:  # If it's an open space
-                    # Count adjacent open spaces
-                    adjacent_open = 0
-                    for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:
-                        nx, ny = x+dx, y+dy
-                        if (0 <= nx < len(game_map[0]) and 
-                            0 <= ny < len(game_map) and 
-                            game_map[ny][nx] == 0):
-                            adjacent_open += 1
-                    
-                    if adjacent_open <= 1:
-                        features["enclosed_areas"] += 1
-                    elif adjacent_open == 2:
-                        features["corridors"] += 1
-                    else:
-                        features["open_spaces"] += 1
+        # Sample every other interior cell, bucketing open cells by how many
+        # of their four neighbors are open. Each sampled row is processed as
+        # one zip over shifted slices rather than per-cell index arithmetic.
+        open_counts = [0] * 5
+        for y in range(1, height-1, 2):
+            above, row, below = game_map[y-1], game_map[y], game_map[y+1]
+            for up, left, cell, right, down in zip(above[1:width-1:2], row[0:width-2:2],
+                                                   row[1:width-1:2], row[2:width:2],
+                                                   below[1:width-1:2]):
+                if cell == 0:  # If it's an open space
+                    open_counts[(up == 0) + (left == 0) + (right == 0) + (down == 0)] += 1
+        
+        features["enclosed_areas"] = open_counts[0] + open_counts[1]
+        features["corridors"] = open_counts[2]
+        features["open_spaces"] = open_counts[3] + open_counts[4]
         
         return features
     
     def get_theme_for_level(self, level_name, game_map=None):
         """Select an appropriate dream theme based on level characteristics."""
-        themes = list(self.themes.keys())
+        while True:
+            theme = self._select_theme(level_name, game_map)
+            if theme is None or self._get_theme_text(theme) is not None:
+                return theme
+            # The theme's file turned out to be bad and was dropped from the
+            # usable ids, so choose again among the rest
+            self._index_themes()
+    
+    def _select_theme(self, level_name, game_map):
+        """Pick a theme id for a level, without checking that the theme loads."""
+        themes = self._theme_keys
         if not themes:
             print("WARNING: No dream themes available!")
             return None
         
         # Extract level number if procedural
-        level_num = 0
-        if level_name.startswith("proc_"):
-            try:
-                level_num = int(level_name.split("_")[1])
-            except (ValueError, IndexError):
-                pass
+        level_num = _parse_proc_level(level_name)
         
         # Use map structure to influence theme selection
         if game_map:
@@ -162,10 +429,13 @@ class DreamManager:
         
         # Avoid repeating recent themes
         if len(self.state["visited_dreams"]) > 0:
-            recent_themes = list(self.state["visited_dreams"])[-2:]
+            recent_themes = self._recent_themes
             available_themes = [t for t in themes if t not in recent_themes]
             
             if available_themes:
+                # Set for O(1) membership tests when intersecting with categories
+                available_set = set(available_themes)
+                
                 # Group themes by emotional tone for smarter selection
                 theme_categories = self._categorize_themes()
                 
@@ -174,13 +444,13 @@ class DreamManager:
                     positive_themes = theme_categories.get("positive", [])
                     if positive_themes and random.random() < 0.6:  # 60% chance to match emotion
                         return self._weighted_theme_choice(
-                            [t for t in positive_themes if t in available_themes] or available_themes
+                            [t for t in positive_themes if t in available_set] or available_themes
                         )
                 elif self.state["emotional_state"] == "negative":
                     negative_themes = theme_categories.get("negative", [])
                     if negative_themes and random.random() < 0.6:
                         return self._weighted_theme_choice(
-                            [t for t in negative_themes if t in available_themes] or available_themes
+                            [t for t in negative_themes if t in available_set] or available_themes
                         )
                 
                 # Otherwise select from all available
@@ -191,18 +461,14 @@ class DreamManager:
             # Use level number to seed the selection, but add randomness
             base_index = level_num % len(themes)
             
-            # For some levels, pick completely randomly for variety
-            if level_num > 0 and random.random() < 0.3:
-                return random.choice(themes)
+            # Every third level swaps in a different theme for variety,
+            # chosen from the level number so saves stay reproducible
+            if level_num > 0 and level_num % 3 == 0 and len(themes) > 1:
+                alternatives = self._theme_keys_excluding[themes[base_index]]
+                return alternatives[(level_num // 3 - 1) % len(alternatives)]
             
             # Otherwise use a weighted selection around the base index
-            weights = {}
-            for i, theme in enumerate(themes):
-                # Higher weight for the base theme, lower for others
-                distance = min(abs(i - base_index), len(themes) - abs(i - base_index))
-                weights[theme] = 1.0 - (distance * 0.2)
-            
-            return self._weighted_theme_choice(themes, weights=weights)
+            return random.choices(themes, weights=self._proc_theme_weights[base_index])[0]
         else:
             # For non-procedural levels, use random selection
             return random.choice(themes)
@@ -211,255 +477,168 @@ class DreamManager:
     def _weighted_theme_choice(self, themes, weights=None, base_weight=0.5):
         """Make a weighted random choice from available themes."""
         if not themes:
-            return random.choice(list(self.themes.keys()))
-        
-        # Use provided weights or equal weighting
-        theme_weights = {}
+            return random.choice(self._theme_keys)
         
         # Check if weights is a number (backward compatibility) or a dict
         if isinstance(weights, (int, float)):
             base_weight = weights
             weights = None
         
-        for theme in themes:
-            if weights and theme in weights:
-                theme_weights[theme] = weights[theme]
-            else:
-                theme_weights[theme] = base_weight
-        
-        # Normalize weights
-        total = sum(theme_weights.values())
-        if total > 0:  # Avoid division by zero
-            for theme in theme_weights:
-                theme_weights[theme] /= total
+        # Use provided weights or equal weighting (negative weights count as zero)
+        if weights:
+            theme_weights = [max(weights.get(theme, base_weight), 0) for theme in themes]
         else:
-            # If all weights are zero, use equal weights
-            for theme in theme_weights:
-                theme_weights[theme] = 1.0 / len(theme_weights)
-        
-        # Make weighted choice
-        r = random.random()
-        cumulative = 0
-        for theme, weight in theme_weights.items():
-            cumulative += weight
-            if r <= cumulative:
-                return theme
+            theme_weights = [max(base_weight, 0)] * len(themes)
         
-        # Fallback
-        return random.choice(themes)
+        # If all weights are zero, use equal weights
+        if sum(theme_weights) <= 0:
+            return random.choice(themes)
+        
+        # random.choices handles unnormalized weights natively
+        return random.choices(themes, weights=theme_weights)[0]
     
     def _categorize_themes(self):
         """Categorize themes by emotional tone for more coherent selection."""
-        categories = {
-            "positive": ["flying", "nature", "floating", "water"],
-            "negative": ["chase", "teeth", "unprepared"],
-            "neutral": ["labyrinth", "falling", "classroom", "mansion"]
+        return self._theme_categories
+    
+    def _build_theme_categories(self):
+        """Group loaded themes by emotional tone, once per theme load."""
+        themes = self._theme_keys
+        # Uncategorized themes count as neutral
+        return {
+            "positive": tuple(t for t in themes if t in _POSITIVE_THEMES),
+            "negative": tuple(t for t in themes if t in _NEGATIVE_THEMES),
+            "neutral": tuple(t for t in themes
+                             if t not in _POSITIVE_THEMES and t not in _NEGATIVE_THEMES),
         }
-        
-        # Ensure all themes are categorized
-        all_themes = set(self.themes.keys())
-        categorized = set()
-        for themes in categories.values():
-            categorized.update(themes)
-        
-        # Add uncategorized themes to neutral
-        uncategorized = all_themes - categorized
-        categories["neutral"].extend(uncategorized)
-        
-        return categories
     
     def _enhance_narrative(self, base_narrative, theme):
         """Add procedural enhancements to the narrative."""
-        narrative = base_narrative
-        
-        # Add recurring elements from previous dreams
-        if self.state["recurring_elements"] and random.random() < 0.3:
-            element = random.choice(self.state["recurring_elements"])
-            
-            # Use varied phrasing for recurring elements
-            phrases = [
-                f"{element} appears again in the distance.",
-                f"{element} seems familiar to you.",
-                f"You recognize {element} from a previous dream.",
-                f"{element} follows you through the dreamscape."
-            ]
-            narrative += f" {random.choice(phrases)}"
+        parts = []
         
         # Add depth indicators
         if self.state["dream_depth"] > 3:
-            depth_phrases = [
-                "Deeper in the dream:",
-                "As you sink further into sleep:",
-                "The dream intensifies:",
-                "Reality grows more distant:",
-                "The veil between dreams thins:",
-                "Dream logic strengthens:"
-            ]
-            narrative = f"{random.choice(depth_phrases)} {narrative}"
+            parts.append(random.choice(_DEPTH_PHRASES))
+        
+        parts.append(base_narrative)
+        
+        # Add recurring elements from previous dreams
+        element = _maybe_pick(self.state["recurring_elements"], 0.3)
+        if element is not None:
+            # Use varied phrasing for recurring elements
+            parts.append(random.choice(_ECHO_TEMPLATES).format(element=element))
         
         # Adjust tone based on emotional state
-        if self.state["emotional_state"] == "positive" and random.random() < 0.3:
-            positive_modifiers = [
-                "A sense of calm pervades the scene.",
-                "There's an unusual clarity to everything.",
-                "You feel oddly at peace here.",
-                "A pleasant warmth surrounds you.",
-                "Colors seem more vibrant here."
-            ]
-            narrative += f" {random.choice(positive_modifiers)}"
-        elif self.state["emotional_state"] == "negative" and random.random() < 0.3:
-            negative_modifiers = [
-                "An undercurrent of anxiety flows beneath the surface.",
-                "Something feels wrong about this place.",
-                "Unease settles in your chest.",
-                "Shadows seem to move at the edge of your vision.",
-                "A faint sense of dread accompanies you."
-            ]
-            narrative += f" {random.choice(negative_modifiers)}"
-        
-        return narrative
+        modifiers = _TONE_MODIFIERS.get(self.state["emotional_state"])
+        if modifiers:
+            modifier = _maybe_pick(modifiers, 0.3)
+            if modifier is not None:
+                parts.append(modifier)
+        
+        return " ".join(parts)
     
     def _enhance_outcome(self, base_outcome, theme, choice):
         """Add procedural enhancements to the outcome text."""
-        outcome = base_outcome
+        parts = [base_outcome]
         
         # Add depth-based reflections
-        if self.state["dream_depth"] >= 3 and random.random() < 0.4:
-            reflections = [
-                "Something about this feels significant.",
-                "A pattern seems to be forming in your dreams.",
-                "The meaning just eludes your grasp.",
-                "This choice will echo in later dreams.",
-                "Deep meaning resonates beneath the surface.",
-                "This moment feels connected to something larger."
-            ]
-            outcome += f" {random.choice(reflections)}"
+        if self.state["dream_depth"] >= 3:
+            reflection = _maybe_pick(_REFLECTIONS, 0.4)
+            if reflection is not None:
+                parts.append(reflection)
         
         # Add emotional coloring occasionally
-        if random.random() < 0.3:
-            if choice == 'yes':
-                yes_reflections = [
-                    "There's a sense of rightness to your decision.",
-                    "You feel you've chosen well.",
-                    "Something aligns within you.",
-                    "This path feels meant to be."
-                ]
-                outcome += f" {random.choice(yes_reflections)}"
-            else:
-                no_reflections = [
-                    "You wonder what would have happened if you chose differently.",
-                    "A path not taken lingers in your thoughts.",
-                    "The alternative choice echoes in your mind.",
-                    "You feel a moment of hesitation about your decision."
-                ]
-                outcome += f" {random.choice(no_reflections)}"
+        coloring = _maybe_pick(_YES_REFLECTIONS if choice == 'yes' else _NO_REFLECTIONS, 0.3)
+        if coloring is not None:
+            parts.append(coloring)
         
         # Hint at future dreams rarely
-        if self.state["dream_depth"] >= 2 and random.random() < 0.2:
-            foreshadowing = [
-                "You sense this isn't the last time you'll face such a choice.",
-                "This moment will recur in different forms.",
-                "The dream remembers your decision.",
-                "Future dreams will build upon this moment."
-            ]
-            outcome += f" {random.choice(foreshadowing)}"
-        
-        return outcome
+        if self.state["dream_depth"] >= 2:
+            hint = _maybe_pick(_FORESHADOWING, 0.2)
+            if hint is not None:
+                parts.append(hint)
+        
+        return " ".join(parts)
     
     def _update_recurring_elements(self, theme, choice):
         """Update recurring elements based on theme and choice."""
-        new_element = None
-        
-        # Dictionary of elements by theme and choice
-        theme_elements = {
-            "falling": {"yes": "The sensation of weightlessness", 
-                       "no": "The fear of impact"},
-            "chase": {"yes": "The face of your pursuer", 
-                     "no": "The sound of distant footsteps"},
-            "flying": {"yes": "A glimpse of something beyond the clouds", 
-                      "no": "The fear of falling"},
-            "labyrinth": {"yes": "A mysterious door", 
-                         "no": "The feeling of being lost"},
-            "teeth": {"yes": "The feeling of transformation", 
-                     "no": "The feeling of something missing"},
-            "unprepared": {"yes": "An unexpected supporter", 
-                          "no": "The weight of judgment"},
-            "nature": {"yes": "The language of plants", 
-                      "no": "Eyes watching from the foliage"},
-            "water": {"yes": "The freedom of breathing underwater", 
-                     "no": "The depths below"},
-            "mansion": {"yes": "A familiar room", 
-                       "no": "A locked door"},
-            "classroom": {"yes": "An important lesson", 
-                         "no": "A crucial test"}
-        }
-        
-        # Get element if theme and choice match
-        if theme in theme_elements and choice in theme_elements[theme]:
-            new_element = theme_elements[theme][choice]
+        # Look up the element for this theme and choice
+        new_element = _RECURRING_ELEMENTS.get((theme, choice))
         
         # Add procedurally generated elements occasionally
-        if not new_element and random.random() < 0.2:
-            procedural_elements = [
-                "A symbol you can't quite remember",
-                "A familiar voice calling your name",
-                "The scent of something from your childhood",
-                "A color that seems to have meaning",
-                "The sensation of being watched",
-                "A melody that feels important",
-                "An object that shouldn't exist",
-                "A phrase repeated in whispers",
-                "A figure glimpsed in periphery",
-                "A clock showing impossible time"
-            ]
-            new_element = random.choice(procedural_elements)
+        if not new_element:
+            new_element = _maybe_pick(_PROCEDURAL_ELEMENTS, 0.2)
         
         # Add the element if one was selected
         if new_element:
-            if new_element in self.state["recurring_elements"]:
+            recurring = self._recurring_elements
+            if new_element in recurring:
                 # Move to the end if already present
-                self.state["recurring_elements"].remove(new_element)
-            self.state["recurring_elements"].append(new_element)
+                recurring.move_to_end(new_element)
+            else:
+                recurring[new_element] = None
+                
+                # Limit recurring elements
+                if len(recurring) > 3:
+                    recurring.popitem(last=False)
             
-            # Limit recurring elements
-            if len(self.state["recurring_elements"]) > 3:
-                self.state["recurring_elements"] = self.state["recurring_elements"][-3:]
+            # Mirror into the state as a list for existing readers
+            self.state["recurring_elements"] = list(recurring)
+    
+    def _get_theme_text(self, theme):
+        """Return a theme's flattened Theme tuple, or None if it can't load."""
+        theme_text = self._theme_text.get(theme)
+        if theme_text is None:
+            try:
+                data = self.themes[theme]
+            except KeyError:
+                return None
+            if data is dream_themes_builtin.DREAM_THEMES.get(theme):
+                # Built-in themes come already flattened
+                theme_text = dream_themes_builtin.get_theme_text(theme)
+            else:
+                theme_text = dream_themes_builtin.Theme(
+                    tuple(data["narratives"]), tuple(data["questions"]),
+                    tuple(data["outcomes"]["yes"]), tuple(data["outcomes"]["no"])
+                )
+            self._theme_text[theme] = theme_text
+        return theme_text
     
     def get_story_segment(self, level_name, game_map=None):
         """Generate a story segment for the current level."""
         # Determine the dream theme
         theme = self.get_theme_for_level(level_name, game_map)
         
-        # Get theme data
-        theme_data = self.themes[theme]
+        # The chosen theme is known to load
+        narratives, questions, yes_outcomes, no_outcomes = self._get_theme_text(theme)
         
         # Update state
         self.state["visited_dreams"].add(theme)
         self.state["dream_depth"] += 1
+        self._visit_counts[theme] += 1
+        self._recent_themes.append(theme)
         
         # Select narrative and question
-        visits = list(self.state["visited_dreams"]).count(theme)
-        narrative_index = (visits - 1) % len(theme_data["narratives"])
-        question_index = (visits - 1) % len(theme_data["questions"])
+        visit_index = self._visit_counts[theme] - 1
+        question_index = visit_index % len(questions)
         
         # Get narrative text with procedural enhancements
         narrative = self._enhance_narrative(
-            theme_data["narratives"][narrative_index],
+            narratives[visit_index % len(narratives)],
             theme
         )
         
-        # Get question with procedural enhancements
-        question = theme_data["questions"][question_index]
-        
-        # Get outcomes
-        yes_outcome = theme_data["outcomes"]["yes"][question_index]
-        no_outcome = theme_data["outcomes"]["no"][question_index]
+        # Get question and outcomes
+        question = questions[question_index]
+        yes_outcome = yes_outcomes[question_index]
+        no_outcome = no_outcomes[question_index]
         
         # Return formatted story segment (matching original format)
         return {
             "theme": theme,
             "narrative": narrative,
             "question": question,
+            "question_index": question_index,
             "yes_outcome": yes_outcome,
             "no_outcome": no_outcome,
             "choices": ["Y - Yes", "N - No"]
@@ -474,8 +653,10 @@ class DreamManager:
         self.state["choices_made"][theme].append(choice)
         
         # Update emotional state
-        yes_count = sum(1 for c in self.state["choices_made"].get(theme, []) if c == 'yes')
-        no_count = sum(1 for c in self.state["choices_made"].get(theme, []) if c == 'no')
+        counts = self._choice_counts[theme]
+        if choice in counts:
+            counts[choice] += 1
+        yes_count, no_count = counts["yes"], counts["no"]
         
         if yes_count > no_count:
             self.state["emotional_state"] = "positive"
@@ -488,8 +669,8 @@ class DreamManager:
         self._update_recurring_elements(theme, choice)
         
         # Get the appropriate outcome
-        theme_data = self.themes[theme]
-        outcome_text = theme_data["outcomes"]["yes" if choice == 'yes' else "no"][question_index]
+        theme_text = self._get_theme_text(theme)
+        outcome_text = (theme_text.yes_outcomes if choice == 'yes' else theme_text.no_outcomes)[question_index]
         
         # Add procedural enhancements to the outcome
         enhanced_outcome = self._enhance_outcome(outcome_text, theme, choice)
@@ -499,10 +680,13 @@ class DreamManager:
     def get_dream_summary(self):
         """Generate a summary of the dream journey."""
         # Check if state has changed since last summary generation
-        if (self.state["dream_depth"] == self._last_summary_state["dream_depth"] and
-            self.state["emotional_state"] == self._last_summary_state["emotional_state"] and
-            self.state["recurring_elements"] == self._last_summary_state["recurring_elements"] and
-            self.state["visited_dreams"] == self._last_summary_state["visited_dreams"]):
+        summary_key = (
+            self.state["dream_depth"],
+            self.state["emotional_state"],
+            tuple(self.state["recurring_elements"]),
+            frozenset(self.state["visited_dreams"]),
+        )
+        if summary_key == self._last_summary_key:
             # Return cached summary if state hasn't changed
             return self._dream_summary_cache
         
@@ -537,12 +721,7 @@ class DreamManager:
                 parts.append(depth_text)
                 
                 # Emotional state - fixed mapping instead of random choice
-                emotion_mapping = {
-                    "positive": "Your journey has been mostly hopeful.",
-                    "negative": "Your path has been filled with anxiety.",
-                    "neutral": "Your dream has been a balance of light and dark."
-                }
-                emotion_text = emotion_mapping[self.state["emotional_state"]]
+                emotion_text = _EMOTION_SUMMARIES[self.state["emotional_state"]]
                 parts.append(emotion_text)
                 
                 # Add recurring elements if any - use the most recent one for stability
@@ -554,44 +733,58 @@ class DreamManager:
         
         # Update cache and last state
         self._dream_summary_cache = summary
-        self._last_summary_state = {
-            "dream_depth": self.state["dream_depth"],
-            "emotional_state": self.state["emotional_state"],
-            "recurring_elements": self.state["recurring_elements"].copy(),
-            "visited_dreams": self.state["visited_dreams"].copy()
-        }
+        self._last_summary_key = summary_key
         
         return self._dream_summary_cache
     
-# Create a singleton instance
-_dream_manager = DreamManager()
+# One dream manager per session, so concurrent sessions each get their own
+# story without locking. A session is the asyncio task running the code, or
+# the thread outside of any task. The manager is stored with the session
+# that created it: a task starts with a copy of its parent's context, and a
+# manager inherited that way belongs to the parent, not to the new task.
+_dream_manager_var = ContextVar("dream_manager", default=None)
+
+def _current_session():
+    """Return the asyncio task running this code, or the current thread outside one."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.current_thread()
+
+def _manager():
+    """Return the current session's dream manager, creating it on first use."""
+    session = _current_session()
+    owned = _dream_manager_var.get()
+    if owned is None or owned[0] is not session:
+        owned = (session, DreamManager())
+        _dream_manager_var.set(owned)
+    return owned[1]
+
+def __getattr__(name):
+    """Expose the current session's story state as `story_state` for backwards compatibility."""
+    if name == "story_state":
+        return _manager().state
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Compatibility functions that use the DreamManager instance
 def get_dream_theme_for_level(level_name, game_map=None):
     """Compatibility wrapper for DreamManager.get_theme_for_level."""
-    return _dream_manager.get_theme_for_level(level_name, game_map)
+    return _manager().get_theme_for_level(level_name, game_map)
 
 def get_story_segment(level_name, game_map=None):
     """Compatibility wrapper for DreamManager.get_story_segment."""
-    return _dream_manager.get_story_segment(level_name, game_map)
+    return _manager().get_story_segment(level_name, game_map)
 
 def process_story_choice(choice, theme, question_index):
     """Compatibility wrapper for DreamManager.process_choice."""
-    return _dream_manager.process_choice(choice, theme, question_index)
+    return _manager().process_choice(choice, theme, question_index)
 
 def get_dream_summary():
     """Compatibility wrapper for DreamManager.get_dream_summary."""
-    return _dream_manager.get_dream_summary()
+    return _manager().get_dream_summary()
 
 def reset_story():
-    """Reset the story state for a new game."""
-    global story_state, _dream_manager
-    story_state = {
-        "visited_dreams": set(),
-        "choices_made": {},
-        "dream_depth": 0,
-        "recurring_elements": [],
-        "emotional_state": "neutral",
-    }
-    # Recreate the dream manager to reset its state
-    _dream_manager = DreamManager()
+    """Reset the story state for a new game in the current session."""
+    # A fresh manager carries a fresh story state
+    _dream_manager_var.set((_current_session(), DreamManager()))
@@ -2,6 +2,9 @@
 Built-in dream themes for the dream story system.
 Contains the core dream narratives and choices.
 """
+import random
+import sys
+from collections import namedtuple
 
 DREAM_THEMES = {
     "falling": {
@@ -173,3 +176,26 @@ DREAM_THEMES = {
         }
     }
 }
+
+# Flattened, interned copies of the theme text so each lookup is one hash
+# on the theme name plus an attribute access, rather than a walk through
+# the nested dicts above
+Theme = namedtuple('Theme', ['narratives', 'questions', 'yes_outcomes', 'no_outcomes'])
+
+def _intern_all(texts):
+    return tuple(sys.intern(text) for text in texts)
+
+THEMES = {
+    name: Theme(_intern_all(data["narratives"]), _intern_all(data["questions"]),
+                _intern_all(data["outcomes"]["yes"]), _intern_all(data["outcomes"]["no"]))
+    for name, data in DREAM_THEMES.items()
+}
+
+def get_theme_text(theme):
+    """Return the flattened Theme tuple for a built-in theme."""
+    return THEMES[theme]
+
+def get_outcome(theme, answer):
+    """Return a random outcome of a built-in theme for a 'yes' or 'no' answer."""
+    theme_text = THEMES[theme]
+    return random.choice(theme_text.yes_outcomes if answer == "yes" else theme_text.no_outcomes)
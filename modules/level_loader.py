@@ -1,8 +1,9 @@
 from core.player import Player
-from core.entity import generate_entity, Entity
+from core.entity import Entity
 import random
-from collections import deque
-from modules.procedural_generator import generate_procedural_map, get_map_type_info
+from collections import OrderedDict
+from itertools import chain
+from modules.procedural_generator import generate_procedural_map, get_map_type_info, validate_map
 
 # Keep a small set of predefined maps as fallbacks or starting points
 game_maps = {
@@ -20,9 +21,32 @@ game_maps = {
     ]
 }
 
+# Map used whenever a level can't be loaded or generated
+_DEFAULT_MAP = game_maps["level1"]
+
+def _pack_map(game_map):
+    """Pack a map's cells (wall types 0-3) one byte each, for exact compares."""
+    return len(game_map[0]), bytes(chain.from_iterable(game_map))
+
+# Predefined level names, fixed at import
+_LEVEL_NAMES = tuple(game_maps)
+
+# Identify predefined maps by object identity, or by content for copies
+_MAP_ID_TO_NAME = {id(level_map): name for name, level_map in game_maps.items()}
+_MAP_CONTENT_TO_NAME = {_pack_map(level_map): name for name, level_map in game_maps.items()}
+_PREDEFINED_SHAPES = {(len(level_map), len(level_map[0])) for level_map in game_maps.values()}
+
+# Predefined entity fallback positions for each level
+_FALLBACK_POSITIONS = {
+    "level1": (8.5, 8.5),
+    "level2": (3.5, 8.5),
+    "level3": (8.5, 8.5)
+}
+
 # Track game progression
 current_level_number = 0
 generated_maps = {}
+_proc_level_names = []
 
 def load_level(level_name):
     """
@@ -34,17 +58,16 @@ def load_level(level_name):
     Returns:
         list: 2D list representing the game map
     """
-    global generated_maps
+    # If we've already generated this level, return it with a single lookup
+    cached_map = generated_maps.get(level_name)
+    if cached_map is not None:
+        return cached_map
     
     # If it's a numbered procedural level
     if level_name.startswith("proc_"):
         try:
             level_num = int(level_name.split("_")[1])
             
-            # If we've already generated this level, return it
-            if level_name in generated_maps:
-                return generated_maps[level_name]
-            
             # Otherwise generate a new map
             # Keep size reasonable - start small and increase gradually
             map_size = min(10 + int(level_num * 0.5), 20)  # More conservative size growth
@@ -55,31 +78,27 @@ def load_level(level_name):
             
             # Generate the map with error handling
             try:
-                from modules.procedural_generator import generate_procedural_map, validate_map
                 new_map = generate_procedural_map(map_size, difficulty, method=gen_method)
                 
                 # Verify the map is valid
                 if not validate_map(new_map):
                     print(f"Generated map for {level_name} is invalid, using fallback")
                     # Use first level as fallback
-                    new_map = game_maps["level1"]
+                    new_map = _DEFAULT_MAP
             except Exception as e:
                 print(f"Error generating map: {e}, using fallback")
-                new_map = game_maps["level1"]
+                new_map = _DEFAULT_MAP
             
             # Store the generated map
             generated_maps[level_name] = new_map
             return new_map
         except Exception as e:
             print(f"Error in procedural level loading: {e}, using fallback level")
-            return game_maps["level1"]  # Fallback to level1
+            return _DEFAULT_MAP  # Fallback to level1
     
-    # Otherwise use predefined maps as fallbacks
-    elif level_name in game_maps:
-        return game_maps[level_name]
-    else:
-        # Return default level if the requested one doesn't exist
-        return game_maps["level1"]
+    # Otherwise use predefined maps, defaulting to level1 if the requested
+    # one doesn't exist
+    return game_maps.get(level_name, _DEFAULT_MAP)
 
 def get_level_names():
     """
@@ -88,8 +107,11 @@ def get_level_names():
     Returns:
         list: List of level names
     """
-    # For procedural maps, the levels are now infinite
-    return ["proc_" + str(i) for i in range(current_level_number + 1)] + list(game_maps.keys())
+    # For procedural maps, the levels are now infinite; their names are
+    # built once and the list only grows as progression goes further
+    while len(_proc_level_names) <= current_level_number:
+        _proc_level_names.append(f"proc_{len(_proc_level_names)}")
+    return _proc_level_names[:current_level_number + 1] + list(_LEVEL_NAMES)
 
 def transition_to_new_level(current_level):
     """
@@ -151,41 +173,195 @@ def is_path_between(game_map, start_x, start_y, end_x, end_y):
     start_x, start_y = int(start_x), int(start_y)
     end_x, end_y = int(end_x), int(end_y)
     
+    # Work on the map's compact open-cell bytes rather than the nested
+    # lists; positions outside the map count as walls
+    cells, stride = _padded_open_cells(game_map)
+    map_height = len(cells) // stride - 2
+    if not (0 <= start_x < stride - 2 and 0 <= start_y < map_height and
+            0 <= end_x < stride - 2 and 0 <= end_y < map_height):
+        return False
+    start = (start_y + 1) * stride + start_x + 1
+    end = (end_y + 1) * stride + end_x + 1
+    
     # Check if start or end positions are walls
-    if (game_map[start_y][start_x] != 0 or 
-        game_map[end_y][end_x] != 0):
+    if not (cells[start] and cells[end]):
         return False
     
-    # Directions: up, right, down, left
-    directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    # Predefined maps have their connected regions labelled at import
+    cached = _LEVEL_CACHE.get(id(game_map))
+    if cached is not None:
+        labels = cached["labels"]
+        return labels[start] == labels[end]
+    
+    # Reuse a recent flood fill from either endpoint, e.g. the one run
+    # from the player's tile while placing the entity
+    map_id = id(game_map)
+    for tile_x, tile_y, target in ((start_x, start_y, end), (end_x, end_y, start)):
+        cached = _reachable_cache.get((map_id, tile_x, tile_y))
+        if cached is not None and cached[0] is game_map:
+            return bool(cached[1][target])
+    
+    return _bfs_reachable(cells, stride, start, end)
+
+# id(map) -> (map, dict of data derived from it) for recently used maps,
+# least recently used first. Maps are never edited once loaded, so the
+# derived data stays valid; holding the map keeps its id from being
+# reused while the entry exists.
+_map_data_cache = OrderedDict()
+
+def _map_data(game_map):
+    """Return the dict of cached data derived from a map, creating it on first use."""
+    key = id(game_map)
+    entry = _map_data_cache.get(key)
+    if entry is not None and entry[0] is game_map:
+        _map_data_cache.move_to_end(key)
+        return entry[1]
+    
+    data = {}
+    _map_data_cache[key] = (game_map, data)
+    if len(_map_data_cache) > 16:
+        _map_data_cache.popitem(last=False)
+    return data
+
+def _padded_open_cells(game_map):
+    """
+    Return a map flattened into bytes of open cells (1) surrounded by a
+    ring of walls (0), so neighbours are a fixed index delta and never out
+    of bounds, together with its row stride. Built once per map object.
+    """
+    data = _map_data(game_map)
+    open_cells = data.get("open_cells")
+    if open_cells is not None:
+        return open_cells
+    
+    stride = len(game_map[0]) + 2
+    cells = bytearray(stride)
+    for row in game_map:
+        cells.append(0)
+        cells.extend(cell == 0 for cell in row)
+        cells.append(0)
+    cells.extend(bytes(stride))
     
-    # Create a visited map
-    visited = [[False for _ in range(len(game_map[0]))] for _ in range(len(game_map))]
-    visited[start_y][start_x] = True
+    open_cells = data["open_cells"] = (bytes(cells), stride)
+    return open_cells
+
+# (id(map), x, y) -> (map, reachable bytes, stride) for recent flood fills,
+# least recently used first
+_reachable_cache = OrderedDict()
+
+def _reachable_from(game_map, start_x, start_y):
+    """
+    Flood fill from an open cell. Returns bytes in the wall-padded layout
+    of _padded_open_cells with reachable cells set to 1, and its row
+    stride. Recent results are memoized per map and start tile.
+    """
+    key = (id(game_map), start_x, start_y)
+    cached = _reachable_cache.get(key)
+    if cached is not None and cached[0] is game_map:
+        _reachable_cache.move_to_end(key)
+        return cached[1], cached[2]
+    
+    reachable, stride = _flood_fill(game_map, start_x, start_y)
+    reachable = bytes(reachable)
+    _reachable_cache[key] = (game_map, reachable, stride)
+    if len(_reachable_cache) > 8:
+        _reachable_cache.popitem(last=False)
+    return reachable, stride
+
+def _flood_fill(game_map, start_x, start_y):
+    """Mark every open cell reachable from a start tile (see _reachable_from)."""
+    cells, stride = _padded_open_cells(game_map)
+    reachable = bytearray(len(cells))
+    if not (0 <= start_x < stride - 2 and 0 <= start_y < len(cells) // stride - 2):
+        return reachable, stride
+    start = (start_y + 1) * stride + start_x + 1
+    if not cells[start]:
+        return reachable, stride
     
-    # Queue for BFS
-    queue = deque([(start_x, start_y)])
+    reachable[start] = 1
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        append = next_frontier.append
+        for cell in frontier:
+            for neighbor in (cell - stride, cell + 1, cell + stride, cell - 1):
+                if cells[neighbor] and not reachable[neighbor]:
+                    reachable[neighbor] = 1
+                    append(neighbor)
+        frontier = next_frontier
     
-    while queue:
-        x, y = queue.popleft()
+    return reachable, stride
+
+# Scratch buffer reused by every _bfs_reachable call
+_search_buffer = bytearray()
+
+def _bfs_reachable(open_cells, stride, start, end):
+    """
+    Bidirectional breadth-first search between two open cells, given as
+    indices into the padded open-cell bytes of _padded_open_cells.
+    """
+    # Record the search in a reusable scratch copy of the mask; the game
+    # loop is single-threaded, so one module-level buffer is enough
+    cells = _search_buffer
+    cells[:] = open_cells
+    if start == end:
+        return True
+    
+    # Cell states: 0 wall, 1 unvisited, 2 reached from start, 3 reached
+    # from end. Marking the end up front means the search stops as soon
+    # as a neighbour of either frontier belongs to the other side.
+    cells[start] = 2
+    cells[end] = 3
+    start_frontier, end_frontier = [start], [end]
+    
+    # Grow the smaller frontier by one full layer at a time; once either
+    # side runs out of cells, its whole region has been seen
+    while start_frontier and end_frontier:
+        from_start = len(start_frontier) <= len(end_frontier)
+        if from_start:
+            frontier, mark, other = start_frontier, 2, 3
+        else:
+            frontier, mark, other = end_frontier, 3, 2
         
-        # Check if we've reached the destination
-        if x == end_x and y == end_y:
-            return True
+        # The four neighbours (up, right, down, left) are checked inline
+        next_frontier = []
+        append = next_frontier.append
+        for cell in frontier:
+            neighbor = cell - stride
+            state = cells[neighbor]
+            if state == 1:
+                cells[neighbor] = mark
+                append(neighbor)
+            elif state == other:
+                return True
+            neighbor = cell + 1
+            state = cells[neighbor]
+            if state == 1:
+                cells[neighbor] = mark
+                append(neighbor)
+            elif state == other:
+                return True
+            neighbor = cell + stride
+            state = cells[neighbor]
+            if state == 1:
+                cells[neighbor] = mark
+                append(neighbor)
+            elif state == other:
+                return True
+            neighbor = cell - 1
+            state = cells[neighbor]
+            if state == 1:
+                cells[neighbor] = mark
+                append(neighbor)
+            elif state == other:
+                return True
         
-        # Try all four directions
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            
-            # Check if the new position is valid
-            if (0 <= nx < len(game_map[0]) and 
-                0 <= ny < len(game_map) and 
-                game_map[ny][nx] == 0 and 
-                not visited[ny][nx]):
-                visited[ny][nx] = True
-                queue.append((nx, ny))
-    
-    # If we've searched everywhere and didn't find a path
+        if from_start:
+            start_frontier = next_frontier
+        else:
+            end_frontier = next_frontier
+    
+    # One side's region was exhausted without meeting the other
     return False
 
 def find_valid_positions(game_map, min_dist_from_walls=0, min_dist_from_player=0, max_dist_from_player=None, player=None):
@@ -202,51 +378,120 @@ def find_valid_positions(game_map, min_dist_from_walls=0, min_dist_from_player=0
     Returns:
         list: List of (x, y) valid positions
     """
-    valid_positions = []
+    # Open positions are computed once per map and wall distance;
+    # predefined maps have theirs precomputed at import
+    cached = _LEVEL_CACHE.get(id(game_map))
+    if cached is not None and min_dist_from_walls in cached["positions"]:
+        candidates = cached["positions"][min_dist_from_walls]
+    else:
+        candidates = _cached_open_positions(game_map, min_dist_from_walls)
     
-    for y in range(min_dist_from_walls, len(game_map) - min_dist_from_walls):
-        for x in range(min_dist_from_walls, len(game_map[y]) - min_dist_from_walls):
-            if game_map[y][x] != 0:  # Skip wall tiles
-                continue
-                
-            # Check surrounding cells if needed
-            if min_dist_from_walls > 0:
-                too_close_to_wall = False
-                
-                for ny in range(y-min_dist_from_walls, y+min_dist_from_walls+1):
-                    for nx in range(x-min_dist_from_walls, x+min_dist_from_walls+1):
-                        if (ny < 0 or ny >= len(game_map) or nx < 0 or nx >= len(game_map[0]) or 
-                            game_map[ny][nx] != 0):
-                            too_close_to_wall = True
-                            break
-                    if too_close_to_wall:
-                        break
-                
-                if too_close_to_wall:
-                    continue
-            
-            # Calculate position with offset to avoid grid alignment
-            pos_x = x + 0.5  # Center of tile
-            pos_y = y + 0.5
-            
-            # Check distance from player if specified
-            if player and (min_dist_from_player > 0 or max_dist_from_player):
-                dx = pos_x - player.pos_x
-                dy = pos_y - player.pos_y
-                dist = (dx**2 + dy**2)**0.5
-                
-                if (min_dist_from_player > 0 and dist < min_dist_from_player) or \
-                   (max_dist_from_player and dist > max_dist_from_player):
-                    continue
-                    
-                # Check path to player if needed
-                if min_dist_from_player > 0 and not is_path_between(game_map, player.pos_x, player.pos_y, pos_x, pos_y):
-                    continue
-            
-            valid_positions.append((pos_x, pos_y))
+    if not (player and (min_dist_from_player > 0 or max_dist_from_player)):
+        return list(candidates)
+    
+    # Distance limits are compared squared to skip a sqrt per candidate;
+    # an unset limit becomes a bound every candidate passes
+    px, py = player.pos_x, player.pos_y
+    min_dist_sq = min_dist_from_player * min_dist_from_player if min_dist_from_player > 0 else 0.0
+    max_dist_sq = max_dist_from_player * max_dist_from_player if max_dist_from_player else float('inf')
+    
+    # Apply each criterion as one filtering pass over the candidates
+    valid_positions = [(pos_x, pos_y) for pos_x, pos_y in candidates
+                       if min_dist_sq <= (pos_x - px)**2 + (pos_y - py)**2 <= max_dist_sq]
+    
+    # Check paths to the player if needed, using one flood fill from the
+    # player's tile so each candidate is a single lookup; skip the search
+    # entirely when the distance gate already rejected everything
+    if min_dist_from_player > 0 and valid_positions:
+        reachable, stride = _reachable_from(game_map, int(px), int(py))
+        valid_positions = [(pos_x, pos_y) for pos_x, pos_y in valid_positions
+                           if reachable[(int(pos_y) + 1) * stride + int(pos_x) + 1]]
     
     return valid_positions
 
+def _cached_open_positions(game_map, min_dist_from_walls):
+    """Return _open_positions for a map as a tuple, reusing earlier results."""
+    by_distance = _map_data(game_map).setdefault("positions", {})
+    positions = by_distance.get(min_dist_from_walls)
+    if positions is None:
+        positions = by_distance[min_dist_from_walls] = tuple(_open_positions(game_map, min_dist_from_walls))
+    return positions
+
+def _open_positions(game_map, min_dist_from_walls=0):
+    """Return tile-centre positions of open cells at least min_dist_from_walls from any wall."""
+    if min_dist_from_walls <= 0:
+        return [(x + 0.5, y + 0.5)
+                for y, row in enumerate(game_map)
+                for x, cell in enumerate(row) if cell == 0]
+    
+    k = min_dist_from_walls
+    map_height = len(game_map)
+    map_width = len(game_map[0])
+    
+    # The wall check over each (2k+1)x(2k+1) window is separable: first
+    # mark cells whose horizontal run [x-k, x+k] is all open, then keep
+    # cells where that holds for every row in [y-k, y+k]. Cells closer
+    # than k to the map edge never qualify.
+    row_clear = [[k <= x < map_width - k and not any(row[x-k:x+k+1])
+                  for x in range(map_width)]
+                 for row in game_map]
+    
+    positions = []
+    for y in range(k, map_height - k):
+        for x, clear in enumerate(map(all, zip(*row_clear[y-k:y+k+1]))):
+            if clear:
+                # Use the centre of the tile to avoid grid alignment
+                positions.append((x + 0.5, y + 0.5))
+    
+    return positions
+
+def _label_regions(game_map):
+    """
+    Label every open cell with the id of its connected region (0 for
+    walls), as a flat list in the padded layout of _padded_open_cells.
+    """
+    cells, stride = _padded_open_cells(game_map)
+    labels = [0] * len(cells)
+    queue = [0] * len(cells)
+    
+    region = 0
+    for start, is_open in enumerate(cells):
+        if not is_open or labels[start]:
+            continue
+        
+        # Flood fill a new region from this cell. Each cell is queued at
+        # most once, so a preallocated list with a read index serves as
+        # the queue, and the wall padding makes bounds checks unnecessary.
+        region += 1
+        labels[start] = region
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            for neighbor in (cell - stride, cell + 1, cell + stride, cell - 1):
+                if cells[neighbor] and not labels[neighbor]:
+                    labels[neighbor] = region
+                    queue[tail] = neighbor
+                    tail += 1
+    
+    return labels
+
+# Predefined maps never change, so analyze each one once at import: open
+# positions (anywhere, and one tile clear of walls) plus region labels
+# for constant-time reachability checks. Keyed by id() since the maps
+# live in game_maps for the life of the process.
+_LEVEL_CACHE = {
+    id(level_map): {
+        "positions": {
+            0: tuple(_open_positions(level_map, 0)),
+            1: tuple(_open_positions(level_map, 1)),
+        },
+        "labels": _label_regions(level_map),
+    }
+    for level_map in game_maps.values()
+}
+
 def place_player_in_valid_position(player, game_map):
     """Place the player in a valid position in the new level."""
     try:
@@ -254,29 +499,28 @@ def place_player_in_valid_position(player, game_map):
         map_height = len(game_map)
         map_width = len(game_map[0])
         
-        # Try edges first
-        edge_positions = []
-        for y in [1, map_height - 2]:
-            for x in range(1, map_width - 1):
-                if y < len(game_map) and x < len(game_map[0]) and game_map[y][x] == 0 and count_open_neighbors(game_map, x, y) >= 2:
-                    edge_positions.append((x + 0.5, y + 0.5))
+        # Try edges first: the rows and columns just inside the border
+        edge_cells = [(x, y) for y in (1, map_height - 2) for x in range(1, map_width - 1)]
+        edge_cells += [(x, y) for x in (1, map_width - 2) for y in range(1, map_height - 1)]
         
-        for x in [1, map_width - 2]:
-            for y in range(1, map_height - 1):
-                if y < len(game_map) and x < len(game_map[0]) and game_map[y][x] == 0 and count_open_neighbors(game_map, x, y) >= 2:
-                    edge_positions.append((x + 0.5, y + 0.5))
+        # Keep open edge cells with at least two open neighbours, read
+        # straight from the map's padded open-cell bytes
+        cells, stride = _padded_open_cells(game_map)
+        edge_positions = []
+        for x, y in edge_cells:
+            cell = (y + 1) * stride + x + 1
+            if cells[cell] and cells[cell - stride] + cells[cell + 1] + cells[cell + stride] + cells[cell - 1] >= 2:
+                edge_positions.append((x + 0.5, y + 0.5))
         
         if edge_positions:
             player.pos_x, player.pos_y = random.choice(edge_positions)
             print(f"Player positioned at edge: ({player.pos_x}, {player.pos_y})")
             return
             
-        # Fall back to any open spot
-        valid_positions = []
-        for y in range(1, map_height-1):
-            for x in range(1, map_width-1):
-                if game_map[y][x] == 0:
-                    valid_positions.append((x + 0.5, y + 0.5))
+        # Fall back to any open spot off the border, reusing the map's
+        # cached open positions
+        valid_positions = [(pos_x, pos_y) for pos_x, pos_y in find_valid_positions(game_map)
+                           if 1 < pos_x < map_width - 1 and 1 < pos_y < map_height - 1]
                     
         if valid_positions:
             player.pos_x, player.pos_y = random.choice(valid_positions)
@@ -292,14 +536,13 @@ def place_player_in_valid_position(player, game_map):
 
 def count_open_neighbors(game_map, x, y):
     """Count the number of open (non-wall) neighboring cells."""
-    count = 0
-    for dx, dy in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
-        nx, ny = x + dx, y + dy
-        if (0 <= nx < len(game_map[0]) and 
-            0 <= ny < len(game_map) and 
-            game_map[ny][nx] == 0):
-            count += 1
-    return count
+    # Sum the four neighbour tests directly; each is guarded so cells on
+    # the map's edge never index outside it
+    row = game_map[y]
+    return ((y > 0 and game_map[y - 1][x] == 0) +
+            (x + 1 < len(row) and row[x + 1] == 0) +
+            (y + 1 < len(game_map) and game_map[y + 1][x] == 0) +
+            (x > 0 and row[x - 1] == 0))
 
 def generate_entity_for_level_transition(game_map, player):
     """Generate an entity in a valid position that's reachable from the player."""
@@ -338,43 +581,39 @@ def place_entity_at_fallback_position(game_map, player):
     Returns:
         Entity: An entity at a valid fallback position
     """
-    # Try to identify the level type by comparing with known maps
-    for level_name, level_map in game_maps.items():
-        if game_map == level_map:
-            print(f"Using fallback position for {level_name}")
-            
-            # Predefined fallback positions for each level
-            fallback_positions = {
-                "level1": (8.5, 8.5),
-                "level2": (3.5, 8.5),
-                "level3": (8.5, 8.5)
-            }
-            
-            if level_name in fallback_positions:
-                pos_x, pos_y = fallback_positions[level_name]
-                
-                # Verify this position is empty
-                if game_map[int(pos_y)][int(pos_x)] == 0:
-                    # Create entity with bright color
-                    entity_color = (255, 200, 100)  # Bright orange
-                    print(f"Entity placed at fallback position ({pos_x}, {pos_y})")
-                    return Entity(pos_x, pos_y, entity_color, current_map=game_map)
-    
-    # If all else fails, try to find any empty space far from the player
-    empty_positions = []
-    for y in range(len(game_map)):
-        for x in range(len(game_map[y])):
-            if game_map[y][x] == 0:
+    # Try to identify the level type: load_level hands out the stored map
+    # objects, so identity usually suffices; fall back to a content lookup
+    level_name = _MAP_ID_TO_NAME.get(id(game_map))
+    if level_name is None and (len(game_map), len(game_map[0])) in _PREDEFINED_SHAPES:
+        level_name = _MAP_CONTENT_TO_NAME.get(_pack_map(game_map))
+    
+    if level_name in _FALLBACK_POSITIONS:
+        print(f"Using fallback position for {level_name}")
+        pos_x, pos_y = _FALLBACK_POSITIONS[level_name]
+        
+        # Verify this position is empty
+        if game_map[int(pos_y)][int(pos_x)] == 0:
+            # Create entity with bright color
+            entity_color = (255, 200, 100)  # Bright orange
+            print(f"Entity placed at fallback position ({pos_x}, {pos_y})")
+            return Entity(pos_x, pos_y, entity_color, current_map=game_map)
+    
+    # If all else fails, use the empty space farthest from the player,
+    # tracked in a single pass (distances compared squared)
+    best_position = None
+    best_dist_sq = 9.0  # Ensure some minimum distance (3 tiles)
+    for y, row in enumerate(game_map):
+        for x, cell in enumerate(row):
+            if cell == 0:
                 pos_x = x + 0.5
                 pos_y = y + 0.5
-                distance = ((pos_x - player.pos_x)**2 + (pos_y - player.pos_y)**2)**0.5
-                if distance > 3.0:  # Ensure some minimum distance
-                    empty_positions.append((pos_x, pos_y, distance))
-    
-    if empty_positions:
-        # Choose the farthest position
-        empty_positions.sort(key=lambda p: -p[2])  # Sort by distance descending
-        pos_x, pos_y, _ = empty_positions[0]
+                dist_sq = (pos_x - player.pos_x)**2 + (pos_y - player.pos_y)**2
+                if dist_sq > best_dist_sq:
+                    best_dist_sq = dist_sq
+                    best_position = (pos_x, pos_y)
+    
+    if best_position:
+        pos_x, pos_y = best_position
         entity_color = (255, 100, 255)  # Bright pink for last-resort fallback
         print(f"Entity placed at last-resort position ({pos_x}, {pos_y})")
         return Entity(pos_x, pos_y, entity_color, current_map=game_map)
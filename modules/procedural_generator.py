@@ -1,5 +1,6 @@
 import random
 from collections import deque
+from functools import lru_cache
 
 def generate_procedural_map(size=15, difficulty=0.5, method=0):
     """
@@ -34,7 +35,7 @@ def generate_procedural_map(size=15, difficulty=0.5, method=0):
 def generate_room_based_map(size, difficulty):
     """Generate a map with connected rooms."""
     # Create empty map (0=floor, 1=wall)
-    game_map = [[1 for _ in range(size)] for _ in range(size)]
+    game_map = [[1] * size for _ in range(size)]
     
     # Parameters based on difficulty
     min_rooms = max(2, int(3 + difficulty * 4))
@@ -45,30 +46,36 @@ def generate_room_based_map(size, difficulty):
     rooms = []
     num_rooms = random.randint(min_rooms, max_rooms)
     
+    # randint(a, b) is randrange(a, b + 1) behind an extra call; the room
+    # loop makes four draws per room, so go to randrange directly
+    randrange = random.randrange
+    
+    # Per-row bitmasks of the cells taken by placed rooms plus their 1-cell
+    # buffer, so an overlap test is a few integer ANDs
+    occupied = [0] * size
+    
     # Create rooms
     for _ in range(num_rooms):
         # Room width and height
-        w = random.randint(min_size, max_size)
-        h = random.randint(min_size, max_size)
+        w = randrange(min_size, max_size + 1)
+        h = randrange(min_size, max_size + 1)
         
         # Room position (ensure 1 cell border)
-        x = random.randint(1, size - w - 2)
-        y = random.randint(1, size - h - 2)
+        x = randrange(1, size - w - 1)
+        y = randrange(1, size - h - 1)
         
         # Check if the room overlaps with any existing room
-        overlaps = False
-        for room in rooms:
-            room_x, room_y, room_w, room_h = room
-            if (x < room_x + room_w + 1 and x + w + 1 > room_x and
-                y < room_y + room_h + 1 and y + h + 1 > room_y):
-                overlaps = True
-                break
-        
-        if not overlaps:
-            # Carve the room
+        room_mask = ((1 << w) - 1) << x
+        if not any(occupied[ry] & room_mask for ry in range(y, y + h)):
+            # Carve the room one row slice at a time
+            floor = [0] * w
             for ry in range(y, y + h):
-                for rx in range(x, x + w):
-                    game_map[ry][rx] = 0
+                game_map[ry][x:x + w] = floor
+            
+            # Mark the room and its buffer as occupied
+            buffer_mask = ((1 << (w + 2)) - 1) << (x - 1)
+            for ry in range(y - 1, y + h + 1):
+                occupied[ry] |= buffer_mask
             
             # Add room to the list
             rooms.append((x, y, w, h))
@@ -85,33 +92,27 @@ def generate_room_based_map(size, difficulty):
             x2 = rooms[i+1][0] + rooms[i+1][2] // 2
             y2 = rooms[i+1][1] + rooms[i+1][3] // 2
             
-            # Create L-shaped corridor
-            if random.choice([True, False]):
+            # Create L-shaped corridor; the horizontal leg is one slice
+            left, right = min(x1, x2), max(x1, x2) + 1
+            if random.getrandbits(1):
                 # Horizontal then vertical
-                for x in range(min(x1, x2), max(x1, x2) + 1):
-                    game_map[y1][x] = 0
+                game_map[y1][left:right] = [0] * (right - left)
                 for y in range(min(y1, y2), max(y1, y2) + 1):
                     game_map[y][x2] = 0
             else:
                 # Vertical then horizontal
                 for y in range(min(y1, y2), max(y1, y2) + 1):
                     game_map[y][x1] = 0
-                for x in range(min(x1, x2), max(x1, x2) + 1):
-                    game_map[y2][x] = 0
+                game_map[y2][left:right] = [0] * (right - left)
     
     # Make sure borders are walls
-    for y in range(size):
-        game_map[y][0] = game_map[y][size-1] = 1
-    for x in range(size):
-        game_map[0][x] = game_map[size-1][x] = 1
+    for row in game_map:
+        row[0] = row[-1] = 1
+    game_map[0][:] = game_map[-1][:] = [1] * size
     
-    # Add wall types for visual interest (1-3)
-    for y in range(size):
-        for x in range(size):
-            if game_map[y][x] == 1:
-                # 25% chance of special wall types based on difficulty
-                if random.random() < 0.25 * difficulty:
-                    game_map[y][x] = random.randint(1, 3)
+    # Add wall types for visual interest (1-3); 25% chance of special
+    # wall types based on difficulty
+    _decorate_walls(game_map, 0.25 * difficulty)
                     
     return game_map
 
@@ -119,195 +120,252 @@ def generate_cellular_automata_map(size, difficulty):
     """Generate a map using cellular automata (cave-like)."""
     # Initialize with random walls
     wall_probability = 0.4 + difficulty * 0.2
-    game_map = [[1 if random.random() < wall_probability else 0 
+    rand = random.random
+    game_map = [[1 if rand() < wall_probability else 0 
                 for _ in range(size)] for _ in range(size)]
     
     # Ensure borders are walls
-    for y in range(size):
-        game_map[y][0] = game_map[y][size-1] = 1
-    for x in range(size):
-        game_map[0][x] = game_map[size-1][x] = 1
+    for row in game_map:
+        row[0] = row[-1] = 1
+    game_map[0][:] = game_map[-1][:] = [1] * size
+    
+    # Run cellular automata iterations on rows packed into integers with a
+    # 5-bit lane per column, so a whole row is updated by a few big-int ops.
+    # Adding three rows gives each column's wall count, adding that sum
+    # shifted one lane each way gives the 3x3 counts (at most 9), and adding
+    # a bias of 16 - threshold sets bit 4 of each lane that reaches it.
+    shifts = range(0, 5 * size, 5)
+    ones = sum(1 << shift for shift in shifts)
+    lane_bits = ones << 4
+    survive = 12 * ones  # walls stay walls with 4+ walls around them
+    spawn = 11 * ones    # floors turn to wall with 5+
+    edges = 1 | 1 << shifts[-1]
+    rows = [sum(cell << shift for cell, shift in zip(row, shifts)) for row in game_map]
     
-    # Run cellular automata iterations
     iterations = 4 + int(difficulty * 3)
     for _ in range(iterations):
-        new_map = [row[:] for row in game_map]
+        new_rows = rows[:]
         
         for y in range(1, size - 1):
-            for x in range(1, size - 1):
-                # Count walls in 3x3 neighborhood
-                walls = sum(game_map[ny][nx] > 0 
-                           for nx in range(x-1, x+2) 
-                           for ny in range(y-1, y+2))
-                
-                # Apply cellular automata rules
-                if game_map[y][x] > 0:  # Wall
-                    new_map[y][x] = 1 if walls >= 4 else 0
-                else:  # Floor
-                    new_map[y][x] = 1 if walls >= 5 else 0
+            columns = rows[y-1] + rows[y] + rows[y+1]
+            walls = columns + (columns << 5) + (columns >> 5)
+            cells = rows[y] << 4
+            grown = (cells & (walls + survive)) | (~cells & (walls + spawn))
+            new_rows[y] = (grown & lane_bits) >> 4 | edges
         
-        game_map = new_map
+        rows = new_rows
+    
+    game_map = [[row >> shift & 1 for shift in shifts] for row in rows]
     
     # Ensure map connectivity
     ensure_connectivity(game_map)
     
-    # Add wall types for visual interest
-    for y in range(size):
-        for x in range(size):
-            if game_map[y][x] == 1:
-                # 30% chance of special wall types
-                if random.random() < 0.3:
-                    game_map[y][x] = random.randint(1, 3)
+    # Add wall types for visual interest (30% chance)
+    _decorate_walls(game_map, 0.3)
     
     return game_map
 
 def generate_maze_map(size, difficulty):
     """Generate a maze-like map using randomized depth-first search."""
     # Create a map filled with walls
-    game_map = [[1 for _ in range(size)] for _ in range(size)]
+    game_map = [[1] * size for _ in range(size)]
     
     # Choose a random starting point (must be odd coordinates)
     start_x = random.randrange(1, size-1, 2)
     start_y = random.randrange(1, size-1, 2)
+    _carve_maze(game_map, start_x, start_y)
+    
+    # Create some random extra passages for better gameplay (based on difficulty)
+    extra_passages = int((size * size) * 0.05 * difficulty)
+    randrange = random.randrange
+    for _ in range(extra_passages):
+        x = randrange(1, size-1)
+        y = randrange(1, size-1)
+        if game_map[y][x] == 1:
+            game_map[y][x] = 0
+    
+    # Ensure map connectivity after adding random passages
+    ensure_connectivity(game_map)
+    
+    # Add wall types for visual interest (35% chance)
+    _decorate_walls(game_map, 0.35)
+    
+    return game_map
+
+def _carve_maze(game_map, start_x, start_y):
+    """Carve maze passages from (start_x, start_y) with an iterative randomized DFS."""
+    size = len(game_map)
+    randrange = random.randrange
+    
     game_map[start_y][start_x] = 0
     
-    # Stack for backtracking
+    # Stack for backtracking; the current cell is kept in locals so each
+    # step doesn't re-read and unpack the top of the stack
     stack = [(start_x, start_y)]
+    push, pop = stack.append, stack.pop
+    x, y = start_x, start_y
     
     # Directions: (dx, dy)
-    directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]
+    directions = ((0, -2), (2, 0), (0, 2), (-2, 0))
     
-    while stack:
-        x, y = stack[-1]
-        
+    # Reused buffer of open directions, filled up to `count` each step
+    # instead of building a fresh list of tuples
+    unvisited = [None] * 4
+    
+    while True:
         # Find unvisited neighbors
-        unvisited = []
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
+        count = 0
+        for step in directions:
+            nx, ny = x + step[0], y + step[1]
             if (1 <= nx < size-1 and 1 <= ny < size-1 and game_map[ny][nx] == 1):
-                unvisited.append((nx, ny, dx, dy))
+                unvisited[count] = step
+                count += 1
         
-        if unvisited:
+        if count:
             # Choose a random unvisited neighbor
-            nx, ny, dx, dy = random.choice(unvisited)
+            dx, dy = unvisited[randrange(count)]
+            nx, ny = x + dx, y + dy
             
             # Remove the wall between current and chosen cells
             game_map[y + dy//2][x + dx//2] = 0
             game_map[ny][nx] = 0
             
             # Push the chosen cell to the stack
-            stack.append((nx, ny))
+            push((nx, ny))
+            x, y = nx, ny
         else:
             # Backtrack
-            stack.pop()
-    
-    # Create some random extra passages for better gameplay (based on difficulty)
-    extra_passages = int((size * size) * 0.05 * difficulty)
-    for _ in range(extra_passages):
-        x = random.randint(1, size-2)
-        y = random.randint(1, size-2)
-        if game_map[y][x] == 1:
-            game_map[y][x] = 0
-    
-    # Ensure map connectivity after adding random passages
-    ensure_connectivity(game_map)
-    
-    # Add wall types for visual interest
-    for y in range(size):
-        for x in range(size):
-            if game_map[y][x] == 1:
-                # 35% chance of special wall types
-                if random.random() < 0.35:
-                    game_map[y][x] = random.randint(1, 3)
+            pop()
+            if not stack:
+                return
+            x, y = stack[-1]
+
+def _decorate_walls(game_map, chance):
+    """Give each plain wall a random wall type (1-3) with probability `chance`.
     
-    return game_map
+    Uses a single random draw per wall: a value below `chance` is rescaled
+    into the wall type.
+    """
+    rand = random.random
+    for row in game_map:
+        for x, cell in enumerate(row):
+            if cell == 1:
+                r = rand()
+                if r < chance:
+                    row[x] = min(int(r / chance * 3), 2) + 1
 
 def ensure_connectivity(game_map):
     """Ensure all open spaces in the map are connected."""
     size = len(game_map)
-    visited = [[False for _ in range(size)] for _ in range(size)]
     
-    # Find first open space
-    start_x, start_y = None, None
-    for y in range(size):
-        for x in range(size):
-            if game_map[y][x] == 0:
-                start_x, start_y = x, y
-                break
-        if start_x is not None:
-            break
-    
-    if start_x is None:  # No open spaces
+    # Flat copy of the map (1 = open) framed by a ring of walls, so every
+    # neighbour is a single index offset that can't run off the grid
+    stride = size + 2
+    open_cells = bytearray(stride * stride)
+    for y, row in enumerate(game_map):
+        base = (y + 1) * stride + 1
+        open_cells[base:base + size] = bytes(cell == 0 for cell in row)
+    offsets = (-stride, 1, stride, -1)
+    
+    # Label every connected region of open cells in one sweep, recording
+    # each region's first cell (in row order) and its size
+    labels = [0] * len(open_cells)
+    regions = []
+    queue = deque()
+    
+    for start in range(len(open_cells)):
+        if open_cells[start] and not labels[start]:
+            label = len(regions) + 1
+            labels[start] = label
+            queue.append(start)
+            count = 1
+            
+            while queue:
+                idx = queue.popleft()
+                
+                for offset in offsets:
+                    n = idx + offset
+                    if open_cells[n] and not labels[n]:
+                        labels[n] = label
+                        count += 1
+                        queue.append(n)
+            
+            regions.append((start, count))
+    
+    # No open spaces, or already connected
+    if len(regions) <= 1:
         return
     
-    # Perform BFS from the starting point
-    queue = deque([(start_x, start_y)])
-    visited[start_y][start_x] = True
+    # Everything gets connected to the largest region
+    main = max(range(len(regions)), key=lambda i: regions[i][1]) + 1
+    
+    # Spread out from every cell of the main region at once, walking through
+    # walls too, so each cell learns its nearest main-region cell in one
+    # pass. The frame is pre-filled so the search stays inside the map.
+    nearest = [-1] * len(open_cells)
+    for y in range(size):
+        base = (y + 1) * stride + 1
+        nearest[base:base + size] = [None] * size
+    for idx, label in enumerate(labels):
+        if label == main:
+            nearest[idx] = idx
+            queue.append(idx)
     
     while queue:
-        x, y = queue.popleft()
+        idx = queue.popleft()
+        seed = nearest[idx]
         
-        for dx, dy in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < size and 0 <= ny < size and 
-                game_map[ny][nx] == 0 and not visited[ny][nx]):
-                visited[ny][nx] = True
-                queue.append((nx, ny))
-    
-    # Identify disconnected regions and connect them
-    for y in range(1, size-1):
-        for x in range(1, size-1):
-            # FIX: Use x instead of nx (which was undefined)
-            if game_map[y][x] == 0 and not visited[y][x]:
-                # Found a disconnected region, connect it to the main region
-                best_distance = float('inf')
-                best_point = None
-                
-                # Find closest visited open space
-                for vy in range(size):
-                    for vx in range(size):
-                        if game_map[vy][vx] == 0 and visited[vy][vx]:
-                            distance = (vx - x)**2 + (vy - y)**2
-                            if distance < best_distance:
-                                best_distance = distance
-                                best_point = (vx, vy)
-                
-                if best_point:
-                    # Create a path between the points
-                    ax, ay = x, y
-                    bx, by = best_point
-                    
-                    # Mark the start point as visited to avoid infinite loops
-                    visited[ay][ax] = True
-                    
-                    # Limit the number of steps to avoid infinite loops
-                    max_steps = size * 2
-                    steps = 0
-                    
-                    while ((ax != bx) or (ay != by)) and steps < max_steps:
-                        steps += 1
-                        if random.random() < 0.5 and ax != bx:
-                            ax += 1 if ax < bx else -1
-                        elif ay != by:
-                            ay += 1 if ay < by else -1
-                        elif ax != bx:  # Ensure we move even if the random choice didn't work
-                            ax += 1 if ax < bx else -1
-                        
-                        if 0 <= ax < size and 0 <= ay < size:  # Bounds check
-                            game_map[ay][ax] = 0
-                            visited[ay][ax] = True  # Mark as visited
+        for offset in offsets:
+            n = idx + offset
+            if nearest[n] is None:
+                nearest[n] = seed
+                queue.append(n)
+    
+    # Connect each other region from its first cell
+    for label, (start, _) in enumerate(regions, 1):
+        if label == main:
+            continue
+        
+        # Create a path between the points
+        ay, ax = divmod(start, stride)
+        by, bx = divmod(nearest[start], stride)
+        ax, ay, bx, by = ax - 1, ay - 1, bx - 1, by - 1
+        
+        # Limit the number of steps to avoid infinite loops
+        max_steps = size * 2
+        steps = 0
+        
+        while ((ax != bx) or (ay != by)) and steps < max_steps:
+            steps += 1
+            if random.getrandbits(1) and ax != bx:
+                ax += 1 if ax < bx else -1
+            elif ay != by:
+                ay += 1 if ay < by else -1
+            elif ax != bx:  # Ensure we move even if the random choice didn't work
+                ax += 1 if ax < bx else -1
+            
+            if 0 <= ax < size and 0 <= ay < size:  # Bounds check
+                game_map[ay][ax] = 0
+
+@lru_cache(maxsize=32)
+def _fallback_template(size):
+    """Return the deterministic grid pattern of the fallback map as row tuples."""
+    # Walls around the edges and open in the middle: a basic grid pattern
+    # where every third row keeps a wall at every third column for structure
+    open_row = [1] + [0] * (size - 2) + [1]
+    pillar_row = open_row[:]
+    pillar_row[1:size-1:3] = [1] * len(range(1, size-1, 3))
+    
+    walls = (1,) * size
+    open_row, pillar_row = tuple(open_row), tuple(pillar_row)
+    return ((walls,) +
+            tuple(pillar_row if y % 3 == 1 else open_row for y in range(1, size-1)) +
+            (walls,))
 
 def generate_fallback_map(size):
     """Generate a simple, guaranteed-valid map for fallback cases."""
-    # Create a map with walls around the edges and open in the middle
-    game_map = [[1 for _ in range(size)] for _ in range(size)]
-    
-    # Create a simple open area in the middle
-    for y in range(1, size-1):
-        for x in range(1, size-1):
-            # Create a basic grid pattern with some open areas
-            if (x % 3 != 1) or (y % 3 != 1):  # Leave some walls for structure
-                game_map[y][x] = 0
+    # Start from the cached grid pattern; each caller gets its own rows
+    game_map = [list(row) for row in _fallback_template(size)]
     
     # Make sure the map is connected
     ensure_safe_connectivity(game_map)
@@ -322,8 +380,7 @@ def ensure_safe_connectivity(game_map):
     middle = size // 2
     
     # Create horizontal and vertical paths
-    for x in range(1, size-1):
-        game_map[middle][x] = 0
+    game_map[middle][1:size-1] = [0] * (size - 2)
     
     for y in range(1, size-1):
         game_map[y][middle] = 0
@@ -376,11 +433,6 @@ def validate_map(game_map):
     if not game_map or not game_map[0]:
         return False
         
-    # Check that the map has at least some open spaces
-    has_open = False
-    for row in game_map:
-        if 0 in row:
-            has_open = True
-            break
-            
-    return has_open
+    # Check that the map has at least some open spaces; any() stops at
+    # the first row holding one
+    return any(0 in row for row in game_map)
@@ -6,14 +6,44 @@ import pygame
 import random
 import math
 import colorsys
-from functools import lru_cache
+from collections import OrderedDict
 
-# Texture cache to avoid regenerating textures
-texture_cache = {}
+# Texture cache to avoid regenerating textures, kept in least recently used
+# order and bounded by the pixel memory of the surfaces it holds
+texture_cache = OrderedDict()
+_texture_cache_bytes = 0
 
 # Constants
 DEFAULT_TEXTURE_SIZE = 64
 MAX_TEXTURES_PER_TYPE = 4
+MAX_TEXTURE_CACHE_BYTES = 32 * 1024 * 1024
+
+# Each theme's textures are generated at the texture size divided by its
+# factor, then smoothly scaled up; the blurry themes lose nothing at a
+# quarter of the size, while the maze themes keep their sharp edges
+TEXTURE_DOWNSCALE = {
+    'labyrinth': 1,
+    'mansion': 1,
+    'falling': 4,
+    'flying': 4,
+    'floating': 4,
+    'water': 4,
+}
+DEFAULT_TEXTURE_DOWNSCALE = 2
+MIN_INTERNAL_TEXTURE_SIZE = 16
+
+# Fixed permutation of 0-255, doubled so a lookup offset by another entry
+# never needs to wrap
+_PERM = list(range(256))
+random.Random(0).shuffle(_PERM)
+_PERM += _PERM
+
+# Noise lattice values hashed through the permutation table and precomputed
+# once; the lattice wraps beyond its edges
+LATTICE_SIZE = 256
+_LATTICE_MASK = LATTICE_SIZE - 1
+_LATTICE = [[_PERM[_PERM[x] + y] / 255.0 for x in range(LATTICE_SIZE)]
+            for y in range(LATTICE_SIZE)]
 
 def generate_texture(theme, texture_type, wall_type=1, size=DEFAULT_TEXTURE_SIZE, seed=None):
     """
@@ -32,46 +62,61 @@ def generate_texture(theme, texture_type, wall_type=1, size=DEFAULT_TEXTURE_SIZE
     cache_key = (theme, texture_type, wall_type, size, seed)
     
     # Return cached texture if available
-    if cache_key in texture_cache:
-        return texture_cache[cache_key]
+    cached = texture_cache.get(cache_key)
+    if cached is not None:
+        texture_cache.move_to_end(cache_key)
+        return cached
     
-    # Set random seed for consistent generation
-    if seed is not None:
-        random.seed(seed)
+    # Draw from a generator of our own so the global random state is left
+    # alone; a seed gives consistent generation
+    rng = random.Random(seed)
     
-    # Create base surface
-    texture = pygame.Surface((size, size))
+    # Create base surface at the theme's internal size
+    internal_size = size // TEXTURE_DOWNSCALE.get(theme, DEFAULT_TEXTURE_DOWNSCALE)
+    internal_size = min(size, max(MIN_INTERNAL_TEXTURE_SIZE, internal_size))
+    texture = pygame.Surface((internal_size, internal_size))
     
     # Choose generation method based on theme
     if theme in ['labyrinth', 'mansion']:
         # Structured patterns for maze-like dreams
-        generate_maze_texture(texture, theme, texture_type, wall_type)
+        generate_maze_texture(texture, theme, texture_type, wall_type, rng=rng)
     elif theme in ['falling', 'flying', 'floating']:
         # Cloudy, ethereal textures
         generate_cloud_texture(texture, theme, texture_type, wall_type)
     elif theme in ['chase', 'teeth', 'unprepared']:
         # More chaotic, anxiety-inducing textures
-        generate_noise_texture(texture, theme, texture_type, wall_type, turbulence=True)
+        generate_noise_texture(texture, theme, texture_type, wall_type, turbulence=True, rng=rng)
     elif theme in ['water']:
         # Watery, flowing textures
-        generate_water_texture(texture, theme, texture_type, wall_type)
+        generate_water_texture(texture, theme, texture_type, wall_type, rng=rng)
     elif theme in ['nature']:
         # Organic, natural textures
-        generate_nature_texture(texture, theme, texture_type, wall_type)
+        generate_nature_texture(texture, theme, texture_type, wall_type, rng=rng)
     else:
         # Default to basic noise texture
-        generate_noise_texture(texture, theme, texture_type, wall_type)
+        generate_noise_texture(texture, theme, texture_type, wall_type, rng=rng)
     
-    # Cache the generated texture
-    texture_cache[cache_key] = texture
+    # Scale up to the requested size before caching
+    if internal_size != size:
+        texture = pygame.transform.smoothscale(texture, (size, size))
     
-    # Reset random seed
-    if seed is not None:
-        random.seed()
+    # Cache the generated texture
+    _cache_texture(cache_key, texture)
     
     return texture
 
-def generate_maze_texture(texture, theme, texture_type, wall_type):
+def _cache_texture(cache_key, texture):
+    """Add a texture to the cache, evicting the least recently used over budget."""
+    global _texture_cache_bytes
+    texture_cache[cache_key] = texture
+    _texture_cache_bytes += texture.get_width() * texture.get_height() * texture.get_bytesize()
+    
+    # Always keep the newest texture, even if it alone is over budget
+    while _texture_cache_bytes > MAX_TEXTURE_CACHE_BYTES and len(texture_cache) > 1:
+        _, evicted = texture_cache.popitem(last=False)
+        _texture_cache_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+
+def generate_maze_texture(texture, theme, texture_type, wall_type, rng=random):
     """Generate a structured maze-like texture."""
     width, height = texture.get_width(), texture.get_height()
     
@@ -92,34 +137,42 @@ def generate_maze_texture(texture, theme, texture_type, wall_type):
         base_color = [min(c + 20, 255) for c in base_color]
     
     # Create noise grid for the texture
-    grid_size = random.randint(4, 8)
-    noise_grid = [[random.random() for _ in range(grid_size)] for _ in range(grid_size)]
+    grid_size = rng.randint(4, 8)
+    noise_grid = [[rng.random() for _ in range(grid_size)] for _ in range(grid_size)]
+    
+    # Grid columns and pattern stripes depend on only one coordinate
+    grid_columns = [int(x * grid_size / width) for x in range(width)]
+    if theme == 'labyrinth':
+        # Maze-like pattern with straight lines
+        column_stripes = [x % (width//8) < width//16 for x in range(width)]
+        row_stripes = [y % (height//8) < height//16 for y in range(height)]
+    elif theme == 'mansion':
+        # More regular pattern like wallpaper
+        column_stripes = [x % (width//4) < width//8 for x in range(width)]
+        row_stripes = [y % (height//4) < height//8 for y in range(height)]
     
     # Generate texture pixels
+    pixels = []
     for y in range(height):
-        for x in range(width):
-            # Calculate grid coordinates
-            grid_x = int(x * grid_size / width)
-            grid_y = int(y * grid_size / height)
-            
+        noise_row = noise_grid[int(y * grid_size / height)]
+        
+        for x, grid_x in enumerate(grid_columns):
             # Get noise value
-            noise_value = noise_grid[grid_y][grid_x]
+            noise_value = noise_row[grid_x]
             
             # Create structured pattern
             if theme == 'labyrinth':
-                # Maze-like pattern with straight lines
-                if (x % (width//8) < width//16) or (y % (height//8) < height//16):
+                if column_stripes[x] or row_stripes[y]:
                     noise_value *= 0.7
             elif theme == 'mansion':
-                # More regular pattern like wallpaper
-                if (x % (width//4) < width//8) ^ (y % (height//4) < height//8):
+                if column_stripes[x] ^ row_stripes[y]:
                     noise_value *= 0.8
             
             # Calculate color based on noise
-            color = [int(c * (0.8 + noise_value * 0.4)) for c in base_color]
-            
-            # Set pixel color
-            texture.set_at((x, y), color)
+            pixels += [int(c * (0.8 + noise_value * 0.4)) for c in base_color]
+    
+    # Write all pixels at once
+    _blit_pixels(texture, pixels)
     
     return texture
 
@@ -166,50 +219,31 @@ def generate_cloud_texture(texture, theme, texture_type, wall_type):
     persistence = 0.5
     
     # Create texture pixels using value noise
-    for y in range(height):
-        for x in range(width):
-            noise_value = 0
-            amplitude = 1.0
-            frequency = 1.0
-            max_value = 0
-            
-            for i in range(octaves):
-                # Scale coordinates for this octave
-                nx = x * frequency / width
-                ny = y * frequency / height
-                
-                # Get interpolated noise value
-                n = smooth_noise(nx, ny)
-                
-                # Add weighted noise to total
-                noise_value += n * amplitude
-                
-                # Prepare for next octave
-                max_value += amplitude
-                amplitude *= persistence
-                frequency *= 2
-            
-            # Normalize noise value
-            noise_value /= max_value
-            
+    pixels = []
+    for y, row in enumerate(_fractal_noise(width, height, octaves, persistence)):
+        # Theme-specific modifications only vary by row
+        streak = y / height * 0.2
+        banded = (y / height * 10) % 1 < 0.5
+        
+        for noise_value in row:
             # Apply theme-specific modifications
             if theme == 'falling':
                 # Add vertical streaking
-                noise_value = (noise_value * 0.8) + (y / height * 0.2)
+                noise_value = (noise_value * 0.8) + streak
             elif theme == 'flying':
                 # Add horizontal banding
-                if (y / height * 10) % 1 < 0.5:
+                if banded:
                     noise_value = noise_value * 0.9 + 0.1
             
             # Calculate color based on noise
-            color = [int(c * (0.7 + noise_value * 0.6)) for c in base_color]
-            
-            # Set pixel color
-            texture.set_at((x, y), color)
+            pixels += [min(int(c * (0.7 + noise_value * 0.6)), 255) for c in base_color]
+    
+    # Write all pixels at once
+    _blit_pixels(texture, pixels)
     
     return texture
 
-def generate_noise_texture(texture, theme, texture_type, wall_type, turbulence=False):
+def generate_noise_texture(texture, theme, texture_type, wall_type, turbulence=False, rng=random):
     """Generate a noise texture with optional turbulence for chaotic dreams."""
     width, height = texture.get_width(), texture.get_height()
     
@@ -228,7 +262,7 @@ def generate_noise_texture(texture, theme, texture_type, wall_type, turbulence=F
         value_range = (0.3, 0.7)
     else:
         # Default
-        base_hue = random.random()
+        base_hue = rng.random()
         saturation = 0.3
         value_range = (0.4, 0.8)
     
@@ -250,52 +284,59 @@ def generate_noise_texture(texture, theme, texture_type, wall_type, turbulence=F
     octaves = 4
     persistence = 0.6
     
-    for y in range(height):
-        for x in range(width):
-            noise_value = 0
-            amplitude = 1.0
-            frequency = 1.0
-            max_value = 0
-            
-            for i in range(octaves):
-                # Scale coordinates for this octave
+    if turbulence:
+        # The distortion ties each sample to both coordinates, so the
+        # turbulent variant is sampled pixel by pixel. Per octave, each
+        # column's coordinate and vertical distortion (and likewise each
+        # row's) are worked out up front.
+        weights, max_value = _octave_weights(octaves, persistence)
+        octave_columns = []
+        for frequency, amplitude in weights:
+            column = []
+            for x in range(width):
                 nx = x * frequency / width
+                column.append((nx, math.cos(nx * 5) * 0.1))
+            octave_columns.append((frequency, amplitude, column))
+        
+        noise = []
+        for y in range(height):
+            # Add turbulence/distortion for chaotic dreams
+            row_terms = []
+            for frequency, amplitude, column in octave_columns:
                 ny = y * frequency / height
-                
-                # Add turbulence/distortion for chaotic dreams
-                if turbulence:
-                    distort_x = math.sin(ny * 5) * 0.1
-                    distort_y = math.cos(nx * 5) * 0.1
-                    nx += distort_x
-                    ny += distort_y
-                
-                # Get noise value
-                n = smooth_noise(nx, ny)
-                
-                # Add weighted noise to total
-                noise_value += n * amplitude
-                
-                # Prepare for next octave
-                max_value += amplitude
-                amplitude *= persistence
-                frequency *= 2
-            
-            # Normalize noise value
-            noise_value /= max_value
+                row_terms.append((column, amplitude, ny, math.sin(ny * 5) * 0.1))
             
+            row = []
+            for x in range(width):
+                noise_value = 0
+                for column, amplitude, ny, distort_x in row_terms:
+                    nx, distort_y = column[x]
+                    noise_value += smooth_noise(nx + distort_x, ny + distort_y) * amplitude
+                
+                # Normalize noise value
+                row.append(noise_value / max_value)
+            noise.append(row)
+    else:
+        noise = _fractal_noise(width, height, octaves, persistence)
+    
+    # HSV to RGB is linear in the value, so the texture's hue and saturation
+    # are converted once and the result is scaled per pixel
+    r, g, b = colorsys.hsv_to_rgb(base_hue, saturation, 1.0)
+    value_low, value_spread = value_range[0], value_range[1] - value_range[0]
+    
+    pixels = []
+    for row in noise:
+        for noise_value in row:
             # Map noise to value range
-            value = value_range[0] + noise_value * (value_range[1] - value_range[0])
-            
-            # Convert HSV to RGB
-            r, g, b = colorsys.hsv_to_rgb(base_hue, saturation, value)
-            color = (int(r * 255), int(g * 255), int(b * 255))
-            
-            # Set pixel color
-            texture.set_at((x, y), color)
+            value = value_low + noise_value * value_spread
+            pixels += (int(r * value * 255), int(g * value * 255), int(b * value * 255))
+    
+    # Write all pixels at once
+    _blit_pixels(texture, pixels)
     
     return texture
 
-def generate_water_texture(texture, theme, texture_type, wall_type):
+def generate_water_texture(texture, theme, texture_type, wall_type, rng=random):
     """Generate a watery, flowing texture."""
     width, height = texture.get_width(), texture.get_height()
     
@@ -319,20 +360,29 @@ def generate_water_texture(texture, theme, texture_type, wall_type):
     base_color = tuple(max(0, min(255, c)) for c in base_color)
     
     # Water wave parameters
-    wave_length = random.uniform(3.0, 6.0)
-    wave_height = random.uniform(0.2, 0.4)
-    time_factor = random.uniform(0, 10)  # Random phase
+    wave_length = rng.uniform(3.0, 6.0)
+    wave_height = rng.uniform(0.2, 0.4)
+    time_factor = rng.uniform(0, 10)  # Random phase
+    
+    # Create waves with sine functions; the first only varies by column
+    column_waves = [(x / width, math.sin(x / width * wave_length + time_factor) * wave_height)
+                    for x in range(width)]
+    diagonal_phase = time_factor * 1.3
+    
+    # Occasional highlights for water surface, placed up front
+    if texture_type == 'ceiling' or texture_type == 'floor':
+        highlights = _bernoulli_mask(rng, width * height, 0.01)
+    else:
+        highlights = bytes(width * height)
     
+    pixels = []
     for y in range(height):
-        for x in range(width):
-            # Create waves with sine functions
-            fx = x / width
-            fy = y / height
-            
+        fy = y / height
+        wave3 = math.sin(fy * wave_length * 1.3 + time_factor * 0.7) * wave_height * 0.3
+        
+        for (fx, wave1), highlight in zip(column_waves, highlights[y * width:(y + 1) * width]):
             # Multiple overlapping waves
-            wave1 = math.sin(fx * wave_length + time_factor) * wave_height
-            wave2 = math.sin((fx + fy) * wave_length * 0.7 + time_factor * 1.3) * wave_height * 0.5
-            wave3 = math.sin(fy * wave_length * 1.3 + time_factor * 0.7) * wave_height * 0.3
+            wave2 = math.sin((fx + fy) * wave_length * 0.7 + diagonal_phase) * wave_height * 0.5
             
             combined_wave = (wave1 + wave2 + wave3) / 2.0 + 0.5  # Normalize to 0-1
             
@@ -342,23 +392,24 @@ def generate_water_texture(texture, theme, texture_type, wall_type):
             value = max(0, min(1, value))
             
             # Calculate color based on value
-            r = int(base_color[0] * (0.7 + value * 0.6))
-            g = int(base_color[1] * (0.7 + value * 0.6))
-            b = int(base_color[2] * (0.7 + value * 0.6))
+            shade = 0.7 + value * 0.6
+            r = int(base_color[0] * shade)
+            g = int(base_color[1] * shade)
+            b = int(base_color[2] * shade)
             
-            # Add occasional highlights for water surface
-            if texture_type == 'ceiling' or texture_type == 'floor':
-                if random.random() < 0.01:
-                    r = min(255, r + 40)
-                    g = min(255, g + 40)
-                    b = min(255, b + 40)
+            if highlight:
+                r += 40
+                g += 40
+                b += 40
             
-            # Set pixel color
-            texture.set_at((x, y), (r, g, b))
+            pixels += (min(r, 255), min(g, 255), min(b, 255))
+    
+    # Write all pixels at once
+    _blit_pixels(texture, pixels)
     
     return texture
 
-def generate_nature_texture(texture, theme, texture_type, wall_type):
+def generate_nature_texture(texture, theme, texture_type, wall_type, rng=random):
     """Generate an organic, natural texture."""
     width, height = texture.get_width(), texture.get_height()
     
@@ -385,12 +436,26 @@ def generate_nature_texture(texture, theme, texture_type, wall_type):
     octaves = 4
     persistence = 0.6
     
+    weights, max_value = _octave_weights(octaves, persistence)
+    
+    # Basic coordinates and their distance from a vein, per column
+    columns = [(x / width, abs(((x / width * 10) % 1) - 0.5) * 2) for x in range(width)]
+    
+    # Veins for leaves/bark are a choice for the whole texture
+    draw_veins = texture_type == 'ceiling' or (texture_type == 'wall' and rng.random() < 0.7)
+    
+    # Pixels of the floor that may carry pebbles/details, placed up front
+    if texture_type == 'floor':
+        pebbles = _bernoulli_mask(rng, width * height, 0.2)
+    else:
+        pebbles = bytes(width * height)
+    
+    pixels = []
     for y in range(height):
-        for x in range(width):
-            # Basic coordinates
-            fx = x / width
-            fy = y / height
-            
+        fy = y / height
+        vein_y = abs(((fy * 10) % 1) - 0.5) * 2
+        
+        for (fx, vein_x), pebble in zip(columns, pebbles[y * width:(y + 1) * width]):
             # Domain warping (coordinates distortion)
             warp_x = smooth_noise(fx * 3, fy * 3) * 0.2
             warp_y = smooth_noise(fx * 3 + 0.5, fy * 3 + 0.5) * 0.2
@@ -401,34 +466,15 @@ def generate_nature_texture(texture, theme, texture_type, wall_type):
             
             # Generate fractal noise
             noise_value = 0
-            amplitude = 1.0
-            frequency = 1.0
-            max_value = 0
-            
-            for i in range(octaves):
-                # Scale coordinates for this octave
-                nx = sample_x * frequency
-                ny = sample_y * frequency
-                
-                # Get noise value
-                n = smooth_noise(nx, ny)
-                
-                # Add weighted noise to total
-                noise_value += n * amplitude
-                
-                # Prepare for next octave
-                max_value += amplitude
-                amplitude *= persistence
-                frequency *= 2
+            for frequency, amplitude in weights:
+                noise_value += smooth_noise(sample_x * frequency, sample_y * frequency) * amplitude
             
             # Normalize noise value
             noise_value /= max_value
             
             # Add vein-like structures for leaves/bark
-            if texture_type == 'ceiling' or (texture_type == 'wall' and random.random() < 0.7):
-                # Create vein pattern
-                vein_x = abs(((fx * 10) % 1) - 0.5) * 2  # 0-1 distance from vein
-                vein_y = abs(((fy * 10) % 1) - 0.5) * 2
+            if draw_veins:
+                # Create vein pattern (0-1 distance from vein)
                 vein_value = min(vein_x, vein_y)
                 
                 # Combine with noise
@@ -436,42 +482,120 @@ def generate_nature_texture(texture, theme, texture_type, wall_type):
                     noise_value = noise_value * 0.8 + 0.2
             
             # For floor, add some texture variation
-            if texture_type == 'floor':
-                if noise_value > 0.7 and random.random() < 0.2:
-                    # Add pebbles/details
-                    noise_value = noise_value * 1.2
+            if pebble and noise_value > 0.7:
+                # Add pebbles/details
+                noise_value = noise_value * 1.2
             
             # Calculate color based on noise
-            color = [int(c * (0.7 + noise_value * 0.6)) for c in base_color]
-            
-            # Set pixel color
-            texture.set_at((x, y), color)
+            pixels += [min(int(c * (0.7 + noise_value * 0.6)), 255) for c in base_color]
+    
+    # Write all pixels at once
+    _blit_pixels(texture, pixels)
     
     return texture
 
-@lru_cache(maxsize=256)
+def _octave_weights(octaves, persistence):
+    """Return the (frequency, amplitude) of each octave and the amplitude total."""
+    weights = []
+    amplitude = 1.0
+    frequency = 1.0
+    max_value = 0
+    for _ in range(octaves):
+        weights.append((frequency, amplitude))
+        max_value += amplitude
+        amplitude *= persistence
+        frequency *= 2
+    return weights, max_value
+
+def _fractal_noise(width, height, octaves, persistence):
+    """
+    Compute normalized fractal value noise for every pixel of a texture.
+    
+    Octave k samples smooth_noise(x * 2**k / width, y * 2**k / height), so
+    the horizontal interpolation depends only on the column and the lattice
+    row: it is done once per lattice row and shared by all pixel rows
+    between them.
+    
+    Returns:
+        list: Rows of noise values in the 0-1 range
+    """
+    noise = [[0.0] * width for _ in range(height)]
+    weights, max_value = _octave_weights(octaves, persistence)
+    
+    for frequency, amplitude in weights:
+        # Lattice column and smoothed fraction of every pixel column
+        columns = []
+        for x in range(width):
+            nx = x * frequency / width
+            x_int = int(nx)
+            columns.append((x_int, smooth_step(nx - x_int)))
+        
+        # Horizontally interpolated lattice rows, built on first use
+        lattice_rows = {}
+        for y in range(height):
+            ny = y * frequency / height
+            y_int = int(ny)
+            for lattice_y in (y_int, y_int + 1):
+                if lattice_y not in lattice_rows:
+                    values = _LATTICE[lattice_y & _LATTICE_MASK]
+                    lattice_rows[lattice_y] = [
+                        lerp(values[x_int & _LATTICE_MASK],
+                             values[(x_int + 1) & _LATTICE_MASK], t)
+                        for x_int, t in columns]
+            
+            t = smooth_step(ny - y_int)
+            noise[y] = [n + (top + (bottom - top) * t) * amplitude
+                        for n, top, bottom in zip(noise[y], lattice_rows[y_int],
+                                                  lattice_rows[y_int + 1])]
+    
+    return [[n / max_value for n in row] for row in noise]
+
+def _bernoulli_mask(rng, count, chance):
+    """
+    Return a bytearray of count flags, each set independently with the given chance.
+    
+    Rather than drawing once per flag, the gap to the next set flag is drawn
+    from the geometric distribution, so only about count * chance draws are
+    needed.
+    """
+    mask = bytearray(count)
+    log_miss = math.log(1.0 - chance)
+    i = int(math.log(1.0 - rng.random()) / log_miss)
+    while i < count:
+        mask[i] = 1
+        i += 1 + int(math.log(1.0 - rng.random()) / log_miss)
+    return mask
+
+def _blit_pixels(texture, pixels):
+    """Copy a flat, row-major sequence of RGB channel values onto the texture."""
+    image = pygame.image.frombuffer(bytes(pixels), texture.get_size(), 'RGB')
+    texture.blit(image, (0, 0))
+
 def smooth_noise(x, y):
     """Generate a smooth noise value at the given coordinates."""
     # Get integer and fractional parts
     x_int, x_frac = int(x), x - int(x)
     y_int, y_frac = int(y), y - int(y)
     
-    # Get four corner values
-    v1 = random_from_coords(x_int, y_int)
-    v2 = random_from_coords(x_int + 1, y_int)
-    v3 = random_from_coords(x_int, y_int + 1)
-    v4 = random_from_coords(x_int + 1, y_int + 1)
-    
-    # Interpolate
-    i1 = lerp(v1, v2, smooth_step(x_frac))
-    i2 = lerp(v3, v4, smooth_step(x_frac))
-    return lerp(i1, i2, smooth_step(y_frac))
+    # Get four corner values from the lattice
+    x0, x1 = x_int & _LATTICE_MASK, (x_int + 1) & _LATTICE_MASK
+    row0 = _LATTICE[y_int & _LATTICE_MASK]
+    row1 = _LATTICE[(y_int + 1) & _LATTICE_MASK]
+    v1, v2 = row0[x0], row0[x1]
+    v3, v4 = row1[x0], row1[x1]
+    
+    # Interpolate with the smooth step and lerp inlined; the x weight is
+    # shared by both horizontal lerps
+    sx = x_frac * x_frac * (3 - 2 * x_frac)
+    sy = y_frac * y_frac * (3 - 2 * y_frac)
+    i1 = v1 + (v2 - v1) * sx
+    i2 = v3 + (v4 - v3) * sx
+    return i1 + (i2 - i1) * sy
 
-@lru_cache(maxsize=1024)
 def random_from_coords(x, y):
     """Generate a deterministic random value from coordinates."""
-    # Simple hash function
-    return ((x * 12345 + y * 67890) % 65536) / 65536.0
+    # Permutation table hash, looked up in the precomputed lattice
+    return _LATTICE[y & _LATTICE_MASK][x & _LATTICE_MASK]
 
 def lerp(a, b, t):
     """Linear interpolation between a and b by factor t."""
@@ -523,5 +647,6 @@ def get_texture_for_level(level_name, texture_type, wall_type=1):
 
 def clear_texture_cache():
     """Clear the texture cache to free memory."""
-    global texture_cache
+    global texture_cache, _texture_cache_bytes
     texture_cache.clear()
+    _texture_cache_bytes = 0
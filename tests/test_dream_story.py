@@ -0,0 +1,98 @@
+import asyncio
+import os
+import threading
+import unittest
+from unittest import mock
+
+from modules import dream_story
+
+
+class SessionIsolationTest(unittest.TestCase):
+    """Concurrent sessions must each keep their own story state."""
+    
+    def setUp(self):
+        dream_story.reset_story()
+    
+    def test_concurrent_tasks_keep_separate_state(self):
+        # The parent context already has a manager the tasks inherit
+        dream_story.get_story_segment("proc_1")
+        
+        async def session(segments):
+            for level in range(segments):
+                dream_story.get_story_segment(f"proc_{level + 1}")
+                await asyncio.sleep(0)
+            return dream_story.story_state["dream_depth"]
+        
+        async def run_sessions():
+            return await asyncio.gather(session(2), session(3))
+        
+        self.assertEqual(asyncio.run(run_sessions()), [2, 3])
+        self.assertEqual(dream_story.story_state["dream_depth"], 1)
+    
+    def test_threads_keep_separate_state(self):
+        dream_story.get_story_segment("proc_1")
+        depths = {}
+        
+        def session(name, segments):
+            for level in range(segments):
+                dream_story.get_story_segment(f"proc_{level + 1}")
+            depths[name] = dream_story.story_state["dream_depth"]
+        
+        threads = [threading.Thread(target=session, args=(name, segments))
+                   for name, segments in (("a", 2), ("b", 3))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(depths, {"a": 2, "b": 3})
+        self.assertEqual(dream_story.story_state["dream_depth"], 1)
+
+
+class ThemeLoadingTest(unittest.TestCase):
+    """Lazily loaded theme files must not change or skew theme selection."""
+    
+    def setUp(self):
+        dream_story.DreamManager.reload_themes()
+        dream_story.reset_story()
+    
+    def tearDown(self):
+        dream_story.DreamManager.reload_themes()
+        dream_story.reset_story()
+    
+    def test_theme_order_survives_lazy_load_and_reset(self):
+        manager = dream_story._manager()
+        theme_keys = manager._theme_keys
+        levels = [f"proc_{n}" for n in range(3, 40, 3)]
+        themes = [manager.get_theme_for_level(level) for level in levels]
+        
+        manager.themes["water"]
+        dream_story.reset_story()
+        manager = dream_story._manager()
+        
+        self.assertEqual(manager._theme_keys, theme_keys)
+        self.assertEqual([manager.get_theme_for_level(level) for level in levels], themes)
+    
+    def test_invalid_theme_file_is_not_selectable(self):
+        read_theme_file = dream_story._read_theme_file
+        
+        def reject_water(path, validate):
+            if os.path.basename(path) == "water.json":
+                return None
+            return read_theme_file(path, validate)
+        
+        with mock.patch.object(dream_story, "_read_theme_file", reject_water):
+            dream_story.DreamManager.reload_themes()
+            dream_story.reset_story()
+            self.assertIn("water", dream_story._manager()._theme_keys)
+            
+            for level in range(1, 61):
+                segment = dream_story.get_story_segment(f"proc_{level}")
+                self.assertNotEqual(segment["theme"], "water")
+            
+            self.assertNotIn("water", dream_story._manager()._theme_keys)
+            self.assertNotIn("water", dream_story.DreamManager()._theme_keys)
+
+
+if __name__ == "__main__":
+    unittest.main()